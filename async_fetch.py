@@ -0,0 +1,82 @@
+"""
+asyncio HTTP engine on httpx, for fetching many pages from one host over a
+few HTTP/2 connections.
+
+The event loop runs in one background thread. Coroutines are scheduled on
+it from any thread with submit()/run(), so blocking code (the scraper's
+worker threads) can use it through a plain function call while requests
+from every thread share the same connections. Waiting requests are
+coroutines, not threads: thousands of them cost a few sockets and no extra
+threads. Needs httpx with HTTP/2 support (pip install 'httpx[http2]');
+without the h2 package it falls back to HTTP/1.1 keep-alive.
+"""
+import asyncio
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+STREAMS_PER_CONNECTION = 50 # Concurrent HTTP/2 requests per connection (servers commonly allow 100)
+
+
+class AsyncEngine:
+    """
+    One httpx.AsyncClient on a private event loop. max_connections caps the
+    sockets per host; with HTTP/2 each carries many concurrent requests.
+    Requests beyond what the connections can carry wait on a semaphore
+    rather than in httpx's pool, which slows down with thousands queued.
+    """
+
+    def __init__(self, max_connections=4, http2=True, headers=None, proxy=None, timeout=30):
+        import httpx
+
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                logger.warning("h2 is not installed, the async engine uses HTTP/1.1 (pip install 'httpx[http2]')")
+                http2 = False
+        self.errors = (httpx.RequestError,)
+        self._client_options = dict(
+            http2=http2,
+            headers=headers,
+            # Requests queued behind busy connections wait for one instead of timing out
+            timeout=httpx.Timeout(timeout, pool=None),
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            **({'proxy': proxy} if proxy else {}),
+        )
+        self.max_in_flight = max_connections * (STREAMS_PER_CONNECTION if http2 else 1)
+        self._slots = None
+        self._client = None
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name='async-fetch', daemon=True)
+        self._thread.start()
+
+    async def get(self, url, headers=None):
+        """GETs a URL on the engine's loop and returns the httpx.Response. Transport errors raise self.errors."""
+        if self._client is None:
+            import httpx
+
+            # Created on the loop they are used from
+            self._client = httpx.AsyncClient(**self._client_options)
+            self._slots = asyncio.Semaphore(self.max_in_flight)
+        async with self._slots:
+            return await self._client.get(url, headers=headers)
+
+    def submit(self, coroutine):
+        """Schedules a coroutine on the engine's loop and returns a concurrent.futures.Future."""
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop)
+
+    def run(self, coroutine):
+        """Runs a coroutine on the engine's loop and blocks the calling thread until it is done."""
+        return self.submit(coroutine).result()
+
+    def close(self):
+        """Closes the connections and stops the loop thread."""
+        if self._client is not None:
+            self.run(self._client.aclose())
+            self._client = None
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
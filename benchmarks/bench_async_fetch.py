@@ -0,0 +1,89 @@
+"""
+Fetching many GOV.UK pages: worker threads with requests against the
+asyncio engine (async_fetch.py), on the local fake GOV.UK.
+
+Both go through the scraper's retry and rate limit policy, with the rate
+limit lifted to --max-rate. Reports the wall time, the threads used and the
+connections the fake site saw. Needs httpx (pip install 'httpx[http2]').
+The fake site only speaks HTTP/1.1, where a connection carries one request
+at a time, so compare the same number of threads and connections: the
+engine matches the threads' throughput while every pending page is a
+coroutine instead of a thread. Over HTTP/2 (GOV.UK) each of the few
+connections carries many requests at once. httpx's pool does work per
+connection on every request, so it is not meant for dozens of HTTP/1.1
+connections.
+
+    python benchmarks/bench_async_fetch.py --pages 500 --latency 0.2
+"""
+import argparse
+import logging
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..'))
+sys.path.insert(0, BENCH_DIR)
+
+import scraper  # noqa: E402
+from fake_sites import FakeSite, point_scraper_at  # noqa: E402
+
+
+def client_threads():
+    # The fake site runs in this process too; leave out its per-connection threads
+    return sum(1 for thread in threading.enumerate() if 'process_request' not in thread.name)
+
+
+def run(label, fetch_all, site):
+    site.clients.clear()
+    peak_threads = [client_threads()]
+    done = threading.Event()
+
+    def watch():
+        while not done.wait(0.05):
+            peak_threads[0] = max(peak_threads[0], client_threads())
+
+    threading.Thread(target=watch, daemon=True).start()
+    started = time.perf_counter()
+    bodies = fetch_all()
+    elapsed = time.perf_counter() - started
+    done.set()
+    fetched = sum(1 for body in bodies if body)
+    print(f"{label:>18} {elapsed:>8.2f}s {fetched / elapsed:>9.1f} {peak_threads[0]:>8} {len(site.clients):>12} {fetched:>8}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--pages', type=int, default=1000)
+    parser.add_argument('--latency', type=float, default=0.2, help="Mean seconds per fake response")
+    parser.add_argument('--threads', type=int, default=8, help="Worker threads for the requests run")
+    parser.add_argument('--connections', type=int, default=8, help="Connections for the asyncio engine")
+    parser.add_argument('--max-rate', type=float, default=10000.0, help="Requests/second allowed by the rate limiter")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    logging.getLogger('urllib3').setLevel(logging.ERROR)
+    gov = FakeSite('gov', latency=args.latency, seed=1).start()
+    endole = FakeSite('endole').start()
+    point_scraper_at(scraper, gov, endole)
+    scraper.CACHE_ENABLED = False
+    scraper.DEDUPE_LOOKUPS = False
+    scraper.ASYNC_MAX_CONNECTIONS = args.connections
+    scraper.RATE_LIMITERS['gov'] = scraper.AdaptiveRateLimiter(args.max_rate, args.max_rate, burst=args.pages)
+    urls = [f"{gov.base_url}/company/{i:08d}" for i in range(args.pages)]
+
+    print(f"{args.pages} pages, {args.latency * 1000:.0f}ms mean latency")
+    print(f"{'engine':>18} {'time':>9} {'pages/s':>9} {'threads':>8} {'connections':>12} {'fetched':>8}")
+    with ThreadPoolExecutor(max_workers=args.threads) as executor:
+        run(f"requests x{args.threads}", lambda: list(executor.map(scraper._fetch_url_with_retry, urls)), gov)
+    scraper.SESSIONS.close()
+    run(f"asyncio x{args.connections} conn", lambda: list(scraper.fetch_many(urls).values()), gov)
+    scraper.close_async_engine()
+    gov.stop()
+    endole.stop()
+
+
+if __name__ == "__main__":
+    main()
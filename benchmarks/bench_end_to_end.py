@@ -0,0 +1,142 @@
+"""
+End-to-end scraper benchmark against the local fake GOV.UK and Endole.
+
+Starts the fake sites from fake_sites.py, then runs scraper.main() on a
+synthetic company list once per configuration (sequential, and with more
+worker threads / parse processes), each in a fresh process. Reports rows
+per second, p50/p99 per-company latency (from the run metrics) and peak RSS
+of the scraper process. The response cache is off so every page is fetched,
+and the politeness rate limits are lifted to --max-rate unless --polite.
+
+    python benchmarks/bench_end_to_end.py --rows 200 --latency 0.05 --rate-429 0.01
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..'))
+sys.path.insert(0, BENCH_DIR)
+
+from fake_sites import FakeSite, point_scraper_at, start_sites  # noqa: E402
+
+WORDS = ['ZEPHYR', 'ORCHARD', 'HARBOUR', 'KESTREL', 'MERIDIAN', 'LANTERN', 'GRANITE', 'BRAMBLE']
+KINDS = ['BUILDERS', 'TRADING', 'SERVICES', 'CONSULTING', 'HOLDINGS', 'LOGISTICS']
+
+
+class _Site:
+    """Just enough of FakeSite for point_scraper_at in the child process."""
+
+    def __init__(self, base_url):
+        self.base_url = base_url
+
+
+def child(args):
+    import logging
+
+    import scraper
+
+    logging.basicConfig(level=logging.WARNING)
+    point_scraper_at(scraper, _Site(args.gov_url), _Site(args.endole_url))
+    scraper.CACHE_ENABLED = False
+    scraper.CH_API_BASE_URL = args.api_url
+    if not args.polite:
+        for source in scraper.RATE_LIMITERS:
+            scraper.RATE_LIMITERS[source] = scraper.AdaptiveRateLimiter(args.max_rate, args.max_rate)
+
+    metrics_path = os.path.join(args.workdir, 'metrics.json')
+    started = time.perf_counter()
+    scraper.main([
+        '--input', args.input, '--output', os.path.join(args.workdir, 'out.xlsx'),
+        '--journal', os.path.join(args.workdir, 'journal.jsonl'), '--workers', str(args.workers),
+        '--parse-processes', str(args.parse_processes), '--metrics-json', metrics_path,
+        '--registry', args.registry, '--ch-api-key', 'bench', '--engine', args.engine,
+    ])
+    elapsed = time.perf_counter() - started
+
+    with open(metrics_path) as f:
+        metrics = json.load(f)
+    company = metrics['histograms']['stage_seconds']
+    company = next(h['value'] for h in company if h['labels'] == {'stage': 'company'})
+    found = sum(c['value'] for c in metrics['counters'].get('companies_total', []) if c['labels'].get('outcome') == 'found')
+    print(json.dumps({
+        'rows': company['count'],
+        'found': found,
+        'seconds': elapsed,
+        'p50': company['p50'],
+        'p99': company['p99'],
+        # ru_maxrss is in KiB on Linux
+        'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=200)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 4, 8], help="Worker thread counts to run (1 is the sequential path)")
+    parser.add_argument('--parse-processes', type=int, default=0, help="Also run the largest worker count with this many parse processes")
+    parser.add_argument('--latency', type=float, default=0.05, help="Mean seconds per fake response")
+    parser.add_argument('--rate-429', type=float, default=0.0)
+    parser.add_argument('--rate-403', type=float, default=0.0)
+    parser.add_argument('--rate-challenge', type=float, default=0.0)
+    parser.add_argument('--max-rate', type=float, default=1000.0, help="Requests/second per host allowed by the rate limiters")
+    parser.add_argument('--polite', action='store_true', help="Keep the scraper's real rate limits")
+    parser.add_argument('--registry', choices=['html', 'api'], default='html', help="Registry backend, 'api' uses the fake Companies House API")
+    parser.add_argument('--engine', choices=['sync', 'async'], default='sync', help="Fetch engine for GOV.UK pages ('async' needs httpx)")
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--gov-url', help=argparse.SUPPRESS)
+    parser.add_argument('--endole-url', help=argparse.SUPPRESS)
+    parser.add_argument('--api-url', help=argparse.SUPPRESS)
+    parser.add_argument('--input', help=argparse.SUPPRESS)
+    parser.add_argument('--workdir', help=argparse.SUPPRESS)
+    parser.add_argument('--workers-child', dest='child_workers', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        args.workers = args.child_workers
+        child(args)
+        return
+
+    gov, endole = start_sites(latency=args.latency, rate_429=args.rate_429,
+                              rate_403=args.rate_403, rate_challenge=args.rate_challenge, seed=1)
+    api = FakeSite('api', latency=args.latency, seed=1).start()
+    configs = [(workers, 0) for workers in args.workers]
+    if args.parse_processes:
+        configs.append((max(args.workers), args.parse_processes))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        input_path = os.path.join(tmp, 'companies.csv')
+        with open(input_path, 'w') as f:
+            f.write('Business Name\n')
+            for i in range(args.rows):
+                f.write(f'{WORDS[i % len(WORDS)]} {KINDS[i // len(WORDS) % len(KINDS)]} {i} LIMITED\n')
+
+        print(f"{args.rows} companies ({args.registry} registry, {args.engine} engine), {args.latency * 1000:.0f}ms mean latency, "
+              f"429 {args.rate_429:.0%} / 403 {args.rate_403:.0%} / challenge {args.rate_challenge:.0%}")
+        print(f"{'workers':>7} {'parse':>5} {'rows/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'peak RSS':>9} {'found':>6}")
+        for workers, parse_processes in configs:
+            workdir = tempfile.mkdtemp(dir=tmp)
+            out = subprocess.run(
+                [sys.executable, __file__, '--child', '--gov-url', gov.base_url, '--endole-url', endole.base_url,
+                 '--api-url', api.base_url, '--registry', args.registry, '--engine', args.engine,
+                 '--input', input_path, '--workdir', workdir, '--workers-child', str(workers),
+                 '--parse-processes', str(parse_processes), '--max-rate', str(args.max_rate)]
+                + (['--polite'] if args.polite else []),
+                check=True, capture_output=True, text=True, cwd=workdir
+            ).stdout
+            result = json.loads(out.strip().splitlines()[-1])
+            print(f"{workers:>7} {parse_processes:>5} {result['rows'] / result['seconds']:>8.1f} "
+                  f"{result['p50'] * 1000:>8.0f} {result['p99'] * 1000:>8.0f} {result['peak_rss_mb']:>7.0f}MB "
+                  f"{result['found']:>6}")
+    gov.stop()
+    endole.stop()
+    api.stop()
+
+
+if __name__ == "__main__":
+    main()
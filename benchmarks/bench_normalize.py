@@ -0,0 +1,105 @@
+"""
+Batch normalization benchmark and equivalence check.
+
+Builds a results DataFrame of synthetic addresses and phone numbers, drawn
+from a pool of --distinct addresses since registered offices repeat a lot
+in real output (formation agents, accountants), then cleans it once with the per-row functions (parse_address_components,
+get_city_from_postcode_prefix, clean_phone_number) and once with
+normalize_results_frame, reporting both timings and any row where the
+results differ (exit status 1 if there are any).
+
+    python benchmarks/bench_normalize.py [--rows 100000] [--distinct 20000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import pandas as pd  # noqa: E402
+
+import scraper  # noqa: E402
+
+STREETS = ['12 High Street', 'Unit 4 Riverside Park', 'Flat 2, 88 Park Road', 'Acme House, Station Road', '1 Church Lane', '']
+TOWNS = ['Manchester', 'London', 'Bristol', 'Reading', 'Edinburgh', 'Newport', 'Ely', 'Little Snoring', '']
+COUNTRIES = ['England', 'Wales', 'Scotland', 'United Kingdom', '']
+PHONES = ['0161 496 0000', '+44 20 7946 0000', '020 7946 0000', '07700 900123', 'N/A', 'n/a', '', None, '0044 1234 567890']
+
+
+def random_postcode(rng):
+    prefix = rng.choice(list(scraper.POSTCODE_TO_CITY_MAP) + ['ZZ9', 'XY12', 'QQ'])
+    if not prefix[-1].isdigit():
+        prefix += str(rng.randint(1, 99))
+    postcode = f"{prefix}{rng.choice([' ', ''])}{rng.randint(0, 9)}{rng.choice('ABDEFGHJLNPQRSTUWXYZ')}{rng.choice('ABDEFGHJLNPQRSTUWXYZ')}"
+    return postcode if rng.random() > 0.1 else postcode.lower()
+
+
+def random_address(rng):
+    roll = rng.random()
+    if roll < 0.03:
+        return 'N/A'
+    if roll < 0.05:
+        return None
+    parts = [rng.choice(STREETS), rng.choice(TOWNS), rng.choice(COUNTRIES)]
+    if rng.random() < 0.9:
+        parts.append(random_postcode(rng))
+    if rng.random() < 0.05:
+        parts.append('c/o ' + random_postcode(rng))
+    separator = rng.choice([', ', ',', ' , ', ', , '])
+    return separator.join(parts)
+
+
+def per_row(df):
+    out = df.copy()
+    streets, postcodes, cities, phones = [], [], [], []
+    for full_address, phone in zip(df['Full Address'], df['Telephone']):
+        street, _, postcode = scraper.parse_address_components(full_address if isinstance(full_address, str) else None)
+        streets.append(street)
+        postcodes.append(postcode)
+        cities.append(scraper.get_city_from_postcode_prefix(postcode))
+        phones.append(scraper.clean_phone_number(phone))
+    out['Adress'], out['PostCode'], out['City'], out['Telephone'] = streets, postcodes, cities, phones
+    out['Sector'] = [scraper.map_sic_to_sector(desc) if desc else sector for desc, sector in zip(df['Short Description'], df['Sector'])]
+    return out
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--distinct', type=int, default=20000, help="Number of different addresses")
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    descriptions = ['Construction of domestic buildings', 'Tax consultancy', 'Licensed restaurants', 'Mixed farming', '']
+    addresses = [random_address(rng) for _ in range(args.distinct)]
+    df = pd.DataFrame({
+        'Full Address': [rng.choice(addresses) for _ in range(args.rows)],
+        'Telephone': [rng.choice(PHONES) for _ in range(args.rows)],
+        'Short Description': [rng.choice(descriptions) for _ in range(args.rows)],
+        'Sector': 'N/A',
+    })
+
+    start = time.perf_counter()
+    expected = per_row(df)
+    row_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    actual = scraper.normalize_results_frame(df)
+    batch_seconds = time.perf_counter() - start
+
+    print(f"{args.rows} rows: per-row {row_seconds:.2f}s, batch {batch_seconds:.2f}s ({row_seconds / batch_seconds:.1f}x)")
+    mismatches = 0
+    for column in ['Adress', 'PostCode', 'City', 'Telephone', 'Sector']:
+        differs = expected[column].astype(str) != actual[column].astype(str)
+        mismatches += differs.sum()
+        print(f"  {column:<10} {differs.sum()} rows differ")
+        for idx in differs[differs].index[:5]:
+            print(f"    {df.at[idx, 'Full Address']!r}: {expected.at[idx, column]!r} != {actual.at[idx, column]!r}")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+"""
+Parser backend benchmark over the saved pages in fixtures/pages.
+
+For every page kind and backend it reports the median parse+extract time
+per page and the peak memory allocated while parsing, and checks that
+every backend extracts exactly the same fields as the full html.parser
+parse the scraper originally used.
+
+    python benchmarks/bench_parsers.py [--repeat 50]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import scraper  # noqa: E402
+
+PAGES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'fixtures', 'pages')
+QUERY = 'Acme Builders Ltd'
+
+PAGE_PARSERS = {
+    'gov_search': lambda html: scraper.parse_gov_search_page(html, QUERY),
+    'gov_detail': scraper.parse_gov_detail_page,
+    'endole_search': lambda html: scraper.parse_endole_search_page(html, QUERY),
+    'endole_detail': scraper.parse_endole_detail_page,
+}
+
+BACKENDS = [
+    ('html.parser', False),
+    ('html.parser', True),
+    ('lxml', False),
+    ('lxml', True),
+    ('selectolax', False),
+]
+
+
+def measure(func, html, repeat):
+    """Returns (median seconds, peak bytes allocated) for func(html)."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(html)
+        timings.append(time.perf_counter() - start)
+    tracemalloc.start()
+    func(html)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(timings), peak
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args(argv)
+
+    scraper.logger.disabled = True
+
+    print(f"{'page':<15}{'backend':<28}{'ms/page':>10}{'peak KiB':>10}  output")
+    for page, parse in PAGE_PARSERS.items():
+        with open(os.path.join(PAGES_DIR, page + '.html'), encoding='utf-8') as f:
+            html = f.read()
+
+        expected = None
+        for backend, partial in BACKENDS:
+            if partial and not scraper.PAGE_STRAINERS.get(page):
+                continue
+            if scraper._available_parser(backend) != backend:
+                print(f"{page:<15}{backend:<28}{'not installed':>20}")
+                continue
+            scraper.HTML_PARSER = backend
+            scraper.PARTIAL_PARSING = partial
+            result = parse(html)
+            if expected is None:
+                expected = result
+            seconds, peak = measure(parse, html, args.repeat)
+            label = backend + (' + partial' if partial else '')
+            status = 'same' if result == expected else f'DIFFERS: {result}'
+            print(f"{page:<15}{label:<28}{seconds * 1000:>10.2f}{peak / 1024:>10.0f}  {status}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Postcode index benchmark: build time and size for a synthetic postcode
+list, then single and whole-column lookup rates and the memory the open
+index adds, against the outward-code map lookup it sits in front of.
+
+Postcodes are random but shaped like real ones ('AB12 3CD'), with one
+locality per outward code and a few odd ones out per code.
+
+    python benchmarks/bench_postcode_index.py --postcodes 1000000
+"""
+import argparse
+import csv
+import os
+import random
+import string
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from postcode_index import PostcodeIndex, build  # noqa: E402
+
+LETTERS = string.ascii_uppercase
+
+
+def synthetic_postcodes(count, seed=1):
+    """Yields (postcode, locality) rows, about 300 postcodes per outward code."""
+    rand = random.Random(seed)
+    outwards = {}
+    while len(outwards) < max(1, count // 300):
+        outward = rand.choice(LETTERS) + rand.choice(['', *LETTERS]) + str(rand.randint(1, 99))
+        outwards.setdefault(outward, f'Town {len(outwards)}')
+    outwards = list(outwards.items())
+    seen = set()
+    while len(seen) < count:
+        outward, town = rand.choice(outwards)
+        postcode = f'{outward} {rand.randint(0, 9)}{rand.choice(LETTERS)}{rand.choice(LETTERS)}'
+        if postcode in seen:
+            continue
+        seen.add(postcode)
+        yield postcode, town if rand.random() < 0.9 else f'Village {rand.randint(0, count // 100)}'
+
+
+def rss_mb():
+    """(private, file-backed) resident memory of this process now, in MB (Linux)."""
+    with open('/proc/self/statm') as f:
+        resident, shared = (int(pages) * os.sysconf('SC_PAGE_SIZE') / 1024 ** 2 for pages in f.read().split()[1:3])
+    return resident - shared, shared
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--postcodes', type=int, default=1000000)
+    parser.add_argument('--lookups', type=int, default=200000)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, 'postcodes.csv')
+        index_path = os.path.join(tmp, 'postcodes.idx')
+        with open(csv_path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['pcds', 'locality'])
+            writer.writerows(synthetic_postcodes(args.postcodes))
+        with open(csv_path, newline='') as f:
+            next(f)
+            postcodes = [line.split(',', 1)[0] for line in f]
+
+        started = time.perf_counter()
+        written, outwards = build(csv_path, index_path)
+        built = time.perf_counter() - started
+        size = os.path.getsize(index_path)
+        print(f"build: {written} postcodes, {outwards} outward codes in {built:.1f}s, "
+              f"{size / 1024 ** 2:.1f} MB ({size / written:.1f} B/postcode, CSV {os.path.getsize(csv_path) / 1024 ** 2:.1f} MB)")
+
+        rand = random.Random(2)
+        sample = [rand.choice(postcodes) for _ in range(args.lookups)]
+        # A quarter of them unknown postcodes in known outward codes
+        for i in range(0, len(sample), 4):
+            sample[i] = sample[i][:-2] + 'ZZ'
+
+        before = rss_mb()
+        index = PostcodeIndex(index_path)
+        opened = rss_mb()
+
+        started = time.perf_counter()
+        found = sum(1 for postcode in sample if index.lookup(postcode))
+        single = time.perf_counter() - started
+        after = rss_mb()
+        started = time.perf_counter()
+        column = index.lookup_many(sample)
+        batch = time.perf_counter() - started
+        assert sum(1 for city in column if city) == found
+        index.close()
+
+        print(f"lookup: {len(sample) / single:,.0f}/s one at a time, {len(sample) / batch:,.0f}/s as a column "
+              f"({found} of {len(sample)} found)")
+        print(f"memory: +{opened[0] - before[0]:.1f} MB private to open, +{after[0] - opened[0]:.1f} MB private and "
+              f"+{after[1] - opened[1]:.1f} MB of mapped (reclaimable) file pages after {len(sample)} lookups")
+
+    import scraper
+
+    started = time.perf_counter()
+    for postcode in sample:
+        scraper.get_city_from_postcode_prefix(postcode)
+    print(f"map lookup for comparison: {len(sample) / (time.perf_counter() - started):,.0f}/s")
+
+
+if __name__ == "__main__":
+    main()
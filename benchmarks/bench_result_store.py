@@ -0,0 +1,120 @@
+"""
+Result table benchmark: memory held per result row and DataFrame build time,
+for the list of dicts the output used to be built from and for ResultTable.
+
+Rows are synthetic scraper results read back from JSON lines, as the
+journal and the work queue return them. Checks both give the same output.
+
+    python benchmarks/bench_result_store.py --rows 500000
+"""
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import pandas as pd  # noqa: E402
+
+from result_store import ResultTable  # noqa: E402
+
+CITIES = ['London', 'Manchester', 'Birmingham', 'Leeds', 'Bristol', 'Glasgow', 'Cardiff', 'Belfast', 'N/A']
+SECTORS = ['Construction', 'Retail', 'Professional Services', 'Manufacturing', 'Hospitality', 'N/A']
+STATUSES = ['Active', 'Active', 'Active', 'Dissolved', 'Liquidation', 'N/A']
+TYPES = ['Private limited company', 'Public limited company', 'Limited liability partnership', 'N/A']
+EMPTY = ['Short Description', 'Description', 'Sector Status', 'Compnay Facebook', 'LinkedIn', 'Instagram', 'Youtube',
+         'Researcher', 'Data Cleaner Status', 'Notes', 'Row Fixed', 'QA Status', 'QA Name', 'QA Date',
+         'Reason for Needs Fixing / Invalid', 'QA Notes', 'QAs Review Status', 'TL Notes']
+
+
+def result_lines(rows, seed=1):
+    """JSON lines of scraper-like results, a third of them not found."""
+    rand = random.Random(seed)
+    for i in range(rows):
+        found = rand.random() < 0.67
+        result = {
+            'Business Name': f'COMPANY {i} LIMITED',
+            'Full Address': f'{i} High Street, {rand.choice(CITIES)}, M{i % 90} {i % 9}AB' if found else 'N/A',
+            'Adress': f'{i} High Street' if found else 'N/A',
+            'City': rand.choice(CITIES) if found else 'N/A',
+            'PostCode': f'M{i % 90} {i % 9}AB' if found else 'N/A',
+            'Company Type': rand.choice(TYPES) if found else 'N/A',
+            'SIC': '41201 - Construction of commercial buildings' if found else 'N/A',
+            'Telephone': f'0161{i:07d}' if found and rand.random() < 0.5 else 'N/A',
+            'Website': f'https://company{i}.co.uk' if found and rand.random() < 0.5 else 'N/A',
+            'Email': f'info@company{i}.co.uk' if found and rand.random() < 0.3 else 'N/A',
+            'Sector': rand.choice(SECTORS),
+            'Company Status': rand.choice(STATUSES) if found else 'N/A',
+            'Date': '2026-01-15',
+            'CRN': f'{i:08d}' if found else 'N/A',
+            'Source': 'GOV.UK + Endole' if found else '',
+            'Last Verified': f'2026-01-15T10:{i // 60 % 60:02d}:{i % 60:02d}',
+            'Backfill': '',
+        }
+        result.update({column: '' for column in EMPTY})
+        yield json.dumps(result)
+
+
+def measure(build, lines):
+    """Returns (MB held by the loaded rows, seconds to load, seconds to build the frame, frame)."""
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    held = build.load(lines)
+    loaded = time.perf_counter()
+    mb = tracemalloc.get_traced_memory()[0] / 1024 ** 2
+    tracemalloc.stop()
+    frame = build.frame(held)
+    return mb, loaded - started, time.perf_counter() - loaded, frame
+
+
+class Dicts:
+    name = 'list of dicts'
+
+    @staticmethod
+    def load(lines):
+        return [json.loads(line) for line in lines]
+
+    @staticmethod
+    def frame(rows):
+        return pd.DataFrame(rows)
+
+
+class Table:
+    name = 'ResultTable'
+
+    @staticmethod
+    def load(lines):
+        table = ResultTable()
+        for i, line in enumerate(lines):
+            table.put(i, json.loads(line))
+        return table
+
+    @staticmethod
+    def frame(table):
+        return table.to_frame()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100000)
+    args = parser.parse_args(argv)
+
+    lines = list(result_lines(args.rows))
+    print(f"{args.rows} rows")
+    print(f"{'':<14} {'held MB':>8} {'B/row':>7} {'load s':>7} {'frame s':>8}")
+    frames = []
+    for build in (Dicts, Table):
+        mb, load_seconds, frame_seconds, frame = measure(build, lines)
+        frames.append(frame)
+        print(f"{build.name:<14} {mb:>8.1f} {mb * 1024 ** 2 / args.rows:>7.0f} {load_seconds:>7.2f} {frame_seconds:>8.2f}")
+    same = frames[0].astype(object).equals(frames[1].astype(object))
+    print(f"same output: {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Sector classifier benchmark.
+
+Times SectorClassifier (map_sic_to_sector and the batch version) against
+the original keyword-loop implementation on the descriptions in
+fixtures/sic_descriptions.txt, per row and over a pandas Series, and
+counts the SIC 2007 descriptions (sic_codes.py) that word matching
+classifies differently from the original substring matching. The
+equivalence of substrings=True with the original is tested in
+tests/test_sector.py.
+
+    python benchmarks/bench_sector.py [--rows 100000]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import pandas as pd  # noqa: E402
+
+import scraper  # noqa: E402
+from sic_codes import SIC_DESCRIPTIONS  # noqa: E402
+
+SIC_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'fixtures', 'sic_descriptions.txt')
+
+
+def legacy_map_sic_to_sector(sic_description):
+    """The original map_sic_to_sector, kept here as the reference implementation."""
+    if not sic_description or sic_description.lower() == 'n/a':
+        return 'N/A'
+
+    desc_lower = sic_description.lower()
+    best_match = 'Multi sector company'
+    max_keyword_length = 0
+
+    if 'dormant company' in desc_lower:
+        return 'Dormant company'
+
+    for sector, keywords in scraper.SECTOR_KEYWORDS_MAP_LOWER.items():
+        if sector == 'Dormant company': continue
+
+        for keyword in keywords:
+            if keyword in desc_lower:
+                if len(keyword) > max_keyword_length:
+                    best_match = sector
+                    max_keyword_length = len(keyword)
+
+    return best_match if max_keyword_length > 0 else 'Sector Unknown'
+
+
+def load_descriptions():
+    descriptions = []
+    with open(SIC_FILE, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                # process_company classifies the text after the SIC code
+                descriptions.append(line.split(' - ', 1)[-1].strip())
+    return descriptions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100000, help="Rows in the Series benchmark")
+    args = parser.parse_args(argv)
+
+    descriptions = load_descriptions()
+    changed = [desc for desc in SIC_DESCRIPTIONS.values() if scraper.map_sic_to_sector(desc) != legacy_map_sic_to_sector(desc)]
+    print(f"Word matching: {len(changed)} of {len(SIC_DESCRIPTIONS)} SIC descriptions classified differently "
+          f"from substring matching, e.g. {changed[:3]}")
+
+    # 'first sight' is the scan for a description not memoized yet
+    uncached = lambda desc: scraper.SECTOR_CLASSIFIER._classify(desc.lower())
+    for name, func in [('original', legacy_map_sic_to_sector), ('first sight', uncached),
+                       ('memoized', scraper.map_sic_to_sector)]:
+        start = time.perf_counter()
+        for _ in range(20):
+            for desc in descriptions:
+                func(desc)
+        per_row = (time.perf_counter() - start) / (20 * len(descriptions))
+        print(f"{name:<12} {per_row * 1e6:8.1f} us/description")
+
+    series = pd.Series(descriptions * (args.rows // len(descriptions) + 1)).iloc[:args.rows]
+    start = time.perf_counter()
+    legacy_result = series.map(legacy_map_sic_to_sector)
+    legacy_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    batch_result = scraper.map_sic_to_sector_batch(series)
+    batch_seconds = time.perf_counter() - start
+    print(f"Series of {len(series)} rows: original .map {legacy_seconds:.3f}s, batch {batch_seconds:.3f}s")
+    assert series.map(scraper.map_sic_to_sector).equals(batch_result)
+
+
+if __name__ == "__main__":
+    main()
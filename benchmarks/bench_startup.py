@@ -0,0 +1,112 @@
+"""
+Start-up benchmark: what importing scraper costs, and how long a
+single-company lookup takes from a cold process start.
+
+The first part runs `python -X importtime -c "import scraper"` and lists the
+slowest imports, and whether pandas, bs4 or cloudscraper were loaded (they
+should only be loaded when used). The second starts a fresh process per run
+that looks one company up against the local fake GOV.UK and Endole (as
+`scraper.py lookup` does) and reports the median wall time against --target.
+
+    python benchmarks/bench_startup.py --runs 5 --target 1.0
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.join(BENCH_DIR, '..')
+sys.path.insert(0, ROOT)
+sys.path.insert(0, BENCH_DIR)
+
+HEAVY_MODULES = ('pandas', 'numpy', 'bs4', 'cloudscraper', 'httpx')
+
+
+def import_times():
+    """Returns ({module: cumulative microseconds}, loaded heavy modules) for `import scraper`."""
+    code = f"import sys, json, scraper; print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))"
+    out = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                         cwd=ROOT, capture_output=True, text=True, check=True)
+    times = {}
+    for line in out.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = int(cumulative)
+    return times, json.loads(out.stdout)
+
+
+def child(args):
+    started = time.perf_counter()
+    import logging
+
+    import scraper
+    from fake_sites import point_scraper_at
+
+    imported = time.perf_counter()
+
+    class Site:
+        def __init__(self, base_url):
+            self.base_url = base_url
+
+    logging.basicConfig(level=logging.ERROR)
+    point_scraper_at(scraper, Site(args.gov_url), Site(args.endole_url))
+    scraper.CACHE_ENABLED = False
+    scraper.URL_MAP_FILE = None
+    for source in scraper.RATE_LIMITERS:
+        scraper.RATE_LIMITERS[source] = scraper.AdaptiveRateLimiter(1000.0, 1000.0)
+    scraper.main(['lookup', args.company_name])
+    print(json.dumps({'import': imported - started}), file=sys.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--target', type=float, default=1.0, help="Seconds a cold single-company lookup should take at most")
+    parser.add_argument('--top', type=int, default=10, help="Slowest imports to list")
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--gov-url', help=argparse.SUPPRESS)
+    parser.add_argument('--endole-url', help=argparse.SUPPRESS)
+    parser.add_argument('--company-name', default='ZEPHYR TRADING LIMITED', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        child(args)
+        return
+
+    times, heavy = import_times()
+    print(f"import scraper: {times.get('scraper', 0) / 1000:.0f}ms")
+    for name, micros in sorted(times.items(), key=lambda item: -item[1])[1:args.top + 1]:
+        print(f"  {micros / 1000:>6.1f}ms {name}")
+    print(f"heavy modules loaded at import: {', '.join(heavy) or 'none'}")
+
+    from fake_sites import start_sites
+
+    gov, endole = start_sites(seed=1)
+    walls, imports = [], []
+    with tempfile.TemporaryDirectory() as tmp:
+        for _ in range(args.runs):
+            started = time.perf_counter()
+            out = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), '--child', '--gov-url', gov.base_url,
+                 '--endole-url', endole.base_url, '--company-name', args.company_name],
+                cwd=tmp, capture_output=True, text=True, check=True
+            )
+            walls.append(time.perf_counter() - started)
+            imports.append(json.loads(out.stderr.strip().splitlines()[-1])['import'])
+            json.loads(out.stdout)
+    gov.stop()
+    endole.stop()
+
+    wall = statistics.median(walls)
+    print(f"cold lookup: {wall:.2f}s median of {args.runs} (import {statistics.median(imports):.2f}s), "
+          f"target {args.target:.2f}s: {'ok' if wall <= args.target else 'over'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Peak memory of writing results in chunks versus all at once.
+
+For each input size, a child process reads a synthetic company list and
+writes one result row per company, either with read_chunks + ChunkedWriter
+(the --chunk-size path) or by collecting every result and calling
+DataFrame.to_excel (the default path). Peak RSS should stay flat for the
+chunked path as the row count grows.
+
+    python benchmarks/bench_streaming.py [--rows 20000 100000] [--format xlsx]
+"""
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+RESULT = {
+    'Business Name': '', 'Full Address': '12 High Street, Manchester, M1 1AA', 'Adress': '12 High Street',
+    'City': 'Manchester', 'PostCode': 'M1 1AA', 'Company Type': 'Private limited company',
+    'SIC': '41202 - Construction of domestic buildings', 'Telephone': '1614960000',
+    'Website': 'https://example.com', 'Email': 'info@example.com', 'Short Description': 'Construction of domestic buildings',
+    'Description': 'A company that builds houses. ' * 5, 'Sector': 'Construction', 'Company Status': 'Active', 'CRN': '01234567',
+}
+
+
+def run(mode, input_path, output_path, chunksize):
+    import pandas as pd
+
+    from chunked_io import ChunkedWriter, order_columns, read_chunks
+
+    def result_for(name):
+        return dict(RESULT, **{'Business Name': name})
+
+    if mode == 'chunked':
+        writer = None
+        for chunk in read_chunks(input_path, chunksize):
+            results = [result_for(name) for name in chunk['Business Name']]
+            if writer is None:
+                writer = ChunkedWriter(output_path, order_columns(chunk.columns.tolist(), list(RESULT)))
+            writer.write(results)
+        writer.close()
+    else:
+        df = pd.read_csv(input_path)
+        results = [result_for(name) for name in df['Business Name']]
+        output_df = pd.DataFrame(results)
+        output_df = output_df[order_columns(df.columns.tolist(), output_df.columns.tolist())]
+        if output_path.endswith('.csv'):
+            output_df.to_csv(output_path, index=False)
+        else:
+            output_df.to_excel(output_path, index=False)
+    # ru_maxrss is in KiB on Linux
+    print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[20000, 100000])
+    parser.add_argument('--format', choices=['xlsx', 'csv'], default='xlsx')
+    parser.add_argument('--chunk-size', type=int, default=5000)
+    parser.add_argument('--child', nargs=3, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        run(args.child[0], args.child[1], args.child[2], args.chunk_size)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{'rows':>8}  {'mode':<8} {'peak RSS':>10} {'seconds':>8}")
+        for rows in args.rows:
+            input_path = os.path.join(tmp, f'in-{rows}.csv')
+            with open(input_path, 'w') as f:
+                f.write('Business Name,Notes\n')
+                for i in range(rows):
+                    f.write(f'Company {i} Limited,\n')
+            for mode in ('memory', 'chunked'):
+                output_path = os.path.join(tmp, f'out-{mode}-{rows}.{args.format}')
+                start = time.perf_counter()
+                out = subprocess.run(
+                    [sys.executable, __file__, '--chunk-size', str(args.chunk_size), '--child', mode, input_path, output_path],
+                    check=True, capture_output=True, text=True
+                ).stdout
+                seconds = time.perf_counter() - start
+                print(f"{rows:>8}  {mode:<8} {int(out.split()[-1]) / 1024:>8.0f}MB {seconds:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
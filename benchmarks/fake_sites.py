@@ -0,0 +1,306 @@
+"""
+Local stand-ins for GOV.UK, Endole and the Companies House API, for
+benchmarking and trying changes without touching the real services.
+
+Each site is its own HTTP server (so the scraper tells them apart by host,
+as it does the real ones) and answers every search or company page by
+filling the recorded pages in fixtures/pages with a company name and a CRN
+derived from it. The API stand-in answers the same searches and profiles
+as JSON, requires an API key and enforces a per-key request limit with the
+API's X-Ratelimit-* headers. Latency and failures can be injected: a
+fraction of requests get a 429 with Retry-After, a 403, or a
+Cloudflare-style 503 challenge page. GOV.UK company pages carry an ETag
+and answer a matching If-None-Match with 304 Not Modified. Endole company
+pages requested with a slug other than the one its search results link to
+are redirected (301) to that canonical address.
+
+    python benchmarks/fake_sites.py --latency 0.2 --rate-429 0.01
+"""
+import argparse
+import base64
+import hashlib
+import json
+import math
+import os
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote_plus, urlsplit
+
+PAGES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'fixtures', 'pages')
+
+FIXTURE_NAME = 'ACME BUILDERS LIMITED'
+FIXTURE_CRN = '01234567'
+FIXTURE_SLUG = 'acme-builders-limited'
+
+CHALLENGE_PAGE = """<!DOCTYPE html>
+<html><head><title>Just a moment...</title></head>
+<body><div id="cf-chl-widget">Checking your browser before accessing the site.</div></body></html>
+"""
+
+
+def crn_for(name):
+    """A stable fake company number for a name."""
+    return '%08d' % (int(hashlib.sha1(name.upper().encode('utf-8')).hexdigest(), 16) % 10 ** 8)
+
+
+def slug_for(name):
+    return re.sub(r'[^a-z0-9]+', '-', name.lower()).strip('-')
+
+
+def load_pages():
+    pages = {}
+    for page in ('gov_search', 'gov_detail', 'endole_search', 'endole_detail'):
+        with open(os.path.join(PAGES_DIR, page + '.html'), encoding='utf-8') as f:
+            pages[page] = f.read()
+    return pages
+
+
+def render(template, name, crn=None):
+    crn = crn or crn_for(name)
+    return (template.replace(FIXTURE_NAME, name.upper())
+            .replace(FIXTURE_CRN, crn)
+            .replace(FIXTURE_SLUG, slug_for(name)))
+
+
+def api_profile(name, crn):
+    """A Companies House API company profile matching the recorded GOV.UK pages."""
+    return {
+        'company_name': name.upper(),
+        'company_number': crn,
+        'company_status': 'active',
+        'type': 'ltd',
+        'date_of_creation': '2012-03-15',
+        'sic_codes': ['41201'],
+        'registered_office_address': {
+            'address_line_1': '12 High Street',
+            'locality': 'Manchester',
+            'country': 'England',
+            'postal_code': 'M1 2AB',
+        },
+    }
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # The default backlog of 5 drops connections when many clients connect at once
+    request_queue_size = 256
+
+
+class FakeSite:
+    """
+    One fake site ('gov', 'endole' or 'api') on 127.0.0.1, served from a
+    background thread. latency is the mean seconds added per response
+    (jittered +-50%); the rate_* arguments are the fraction of requests
+    answered with that failure. The API allows api_limit requests per key
+    every api_window seconds.
+    """
+
+    def __init__(self, kind, latency=0.0, rate_429=0.0, rate_403=0.0, rate_challenge=0.0, retry_after=1, seed=None,
+                 api_keys=None, api_limit=600, api_window=300):
+        self.kind = kind
+        self.latency = latency
+        self.rate_429 = rate_429
+        self.rate_403 = rate_403
+        self.rate_challenge = rate_challenge
+        self.retry_after = retry_after
+        self.pages = load_pages()
+        self.random = random.Random(seed)
+        self.counts = {}
+        self.clients = set() # (host, port) of every connection made to the site
+        self.api_keys = set(api_keys or [])
+        self.api_limit = api_limit
+        self.api_window = api_window
+        self._api_requests = {}
+        self._api_names = {}
+        self._endole_names = {} # CRN -> name, for the companies returned by Endole searches
+        self._lock = threading.Lock()
+        self.server = _Server(('127.0.0.1', 0), self._handler())
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _count(self, outcome):
+        with self._lock:
+            self.counts[outcome] = self.counts.get(outcome, 0) + 1
+
+    def _failure(self):
+        with self._lock:
+            roll = self.random.random()
+        if roll < self.rate_429:
+            return 429
+        roll -= self.rate_429
+        if roll < self.rate_403:
+            return 403
+        roll -= self.rate_403
+        if roll < self.rate_challenge:
+            return 503
+        return None
+
+    def _api_key(self, authorization):
+        try:
+            scheme, token = (authorization or '').split(' ', 1)
+            key = base64.b64decode(token).decode().split(':', 1)[0]
+        except ValueError:
+            return None
+        if scheme != 'Basic' or not key or (self.api_keys and key not in self.api_keys):
+            return None
+        return key
+
+    def respond_api(self, path, authorization):
+        """Returns (status, headers, body) for a Companies House API request."""
+        key = self._api_key(authorization)
+        if key is None:
+            return 401, {'Content-Type': 'application/json'}, json.dumps({'error': 'Invalid Authorization'})
+
+        now = time.time()
+        with self._lock:
+            sent = [t for t in self._api_requests.get(key, []) if t > now - self.api_window]
+            allowed = len(sent) < self.api_limit
+            if allowed:
+                sent.append(now)
+            self._api_requests[key] = sent
+        reset = math.ceil((sent[0] if sent else now) + self.api_window)
+        headers = {
+            'Content-Type': 'application/json',
+            'X-Ratelimit-Limit': str(self.api_limit),
+            'X-Ratelimit-Remain': str(max(0, self.api_limit - len(sent))),
+            'X-Ratelimit-Reset': str(reset),
+            'X-Ratelimit-Window': f"{self.api_window}s",
+        }
+        if not allowed:
+            return 429, headers, json.dumps({'error': 'Too Many Requests'})
+
+        parts = urlsplit(path)
+        query = parse_qs(parts.query)
+        if parts.path == '/search/companies' and 'q' in query:
+            name = query['q'][0]
+            items = []
+            for title in [name.upper(), f"{name.upper()} (SOUTH) LTD", f"{name.upper()} HOLDINGS LIMITED"]:
+                crn = crn_for(title)
+                with self._lock:
+                    self._api_names[crn] = title
+                items.append({
+                    'title': title, 'company_number': crn, 'company_status': 'active', 'company_type': 'ltd',
+                    'date_of_creation': '2012-03-15', 'address_snippet': '12 High Street, Manchester, England, M1 2AB',
+                })
+            return 200, headers, json.dumps({'items': items, 'total_results': len(items)})
+        match = re.fullmatch(r'/company/(\w+)', parts.path)
+        if match and match.group(1) in self._api_names:
+            return 200, headers, json.dumps(api_profile(self._api_names[match.group(1)], match.group(1)))
+        return 404, headers, json.dumps({'errors': [{'error': 'company-profile-not-found'}]})
+
+    def respond(self, path, if_none_match=None):
+        """Returns (status, headers, body) for a request path."""
+        parts = urlsplit(path)
+        query = parse_qs(parts.query)
+        name = unquote_plus(query['q'][0]) if 'q' in query else None
+        if self.kind == 'gov':
+            if parts.path == '/search' and name:
+                return 200, {}, render(self.pages['gov_search'], name)
+            match = re.fullmatch(r'/company/(\w+)', parts.path)
+            if match:
+                body = self.pages['gov_detail'].replace(FIXTURE_CRN, match.group(1))
+                etag = '"%s"' % hashlib.sha1(body.encode('utf-8')).hexdigest()[:16]
+                if if_none_match == etag:
+                    return 304, {'ETag': etag}, ''
+                return 200, {'ETag': etag}, body
+        else:
+            if parts.path.rstrip('/') == '/search' and name:
+                with self._lock:
+                    self._endole_names[crn_for(name)] = name
+                return 200, {}, render(self.pages['endole_search'], name)
+            match = re.fullmatch(r'/insight/company/(\w+)-([\w-]*)', parts.path)
+            if match:
+                crn, slug = match.groups()
+                with self._lock:
+                    known = self._endole_names.get(crn)
+                if known and slug != slug_for(known):
+                    return 301, {'Location': f"/insight/company/{crn}-{slug_for(known)}"}, ''
+                return 200, {}, render(self.pages['endole_detail'], slug.replace('-', ' '), crn)
+        return 404, {}, 'Not found'
+
+    def _handler(self):
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                with site._lock:
+                    site.clients.add(self.client_address)
+                if site.latency:
+                    time.sleep(site.latency * (0.5 + site.random.random()))
+                failure = site._failure()
+                if failure == 429:
+                    status, headers, body = 429, {'Retry-After': str(site.retry_after)}, 'Too Many Requests'
+                elif failure == 403:
+                    status, headers, body = 403, {}, 'Forbidden'
+                elif failure == 503:
+                    status, headers, body = 503, {'Server': 'cloudflare'}, CHALLENGE_PAGE
+                elif site.kind == 'api':
+                    status, headers, body = site.respond_api(self.path, self.headers.get('Authorization'))
+                else:
+                    status, headers, body = site.respond(self.path, self.headers.get('If-None-Match'))
+                site._count(status)
+                raw = body.encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', headers.pop('Content-Type', 'text/html; charset=utf-8'))
+                self.send_header('Content-Length', str(len(raw)))
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(raw)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def start_sites(**options):
+    """Starts a fake GOV.UK and a fake Endole with the same options and returns them."""
+    return FakeSite('gov', **options).start(), FakeSite('endole', **options).start()
+
+
+def point_scraper_at(scraper, gov, endole):
+    """Repoints the scraper's base URLs at the fake sites."""
+    scraper.SEARCH_URL_GOV = gov.base_url + '/search?q='
+    scraper.GOV_BASE_URL = gov.base_url
+    scraper.SEARCH_URL_ENDOLE = endole.base_url + '/search/?q='
+    scraper.ENDOLE_DETAIL_BASE_URL = endole.base_url + '/insight/company'
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--latency', type=float, default=0.0, help="Mean seconds per response")
+    parser.add_argument('--rate-429', type=float, default=0.0)
+    parser.add_argument('--rate-403', type=float, default=0.0)
+    parser.add_argument('--rate-challenge', type=float, default=0.0)
+    args = parser.parse_args(argv)
+
+    gov, endole = start_sites(latency=args.latency, rate_429=args.rate_429,
+                              rate_403=args.rate_403, rate_challenge=args.rate_challenge)
+    print(f"GOV.UK: {gov.base_url}/search?q=ACME+BUILDERS+LIMITED")
+    print(f"Endole: {endole.base_url}/search/?q=ACME+BUILDERS+LIMITED")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,288 @@
+"""
+Client for the Companies House public data API
+(https://developer.company-information.service.gov.uk/).
+
+The API serves the same search results and company profiles as the GOV.UK
+pages, as small JSON documents: one search call plus one profile call
+(which carries the registered address and SIC codes) per company. Each API
+key may make 600 requests per 5 minutes; requests are spread over the
+configured keys and paced so no key goes over its window.
+
+    python ch_api.py KEY "Acme Builders Limited"
+"""
+import argparse
+import base64
+import json
+import logging
+import os
+import random
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+import requests
+
+from sic_codes import SIC_DESCRIPTIONS
+
+logger = logging.getLogger(__name__)
+
+API_BASE_URL = "https://api.company-information.service.gov.uk"
+RATE_LIMIT = 600 # Requests per key per window
+RATE_WINDOW = 300 # Seconds
+MAX_RETRIES = 3
+MAX_THROTTLES = 10 # 429 responses tolerated per request before giving up
+
+# The API's company type codes, as the GOV.UK pages spell them out
+COMPANY_TYPES = {
+    'ltd': 'Private limited company',
+    'plc': 'Public limited company',
+    'llp': 'Limited liability partnership',
+    'limited-partnership': 'Limited partnership',
+    'private-unlimited': 'Private unlimited company',
+    'private-unlimited-nsc': 'Private unlimited company without share capital',
+    'private-limited-guarant-nsc': 'Private limited by guarantee without share capital',
+    'private-limited-guarant-nsc-limited-exemption': 'Private limited by guarantee without share capital, use of \'Limited\' exemption',
+    'private-limited-shares-section-30-exemption': 'Private limited company by shares exempt under section 30',
+    'old-public-company': 'Old public company',
+    'oversea-company': 'Overseas company',
+    'registered-overseas-entity': 'Overseas entity',
+    'charitable-incorporated-organisation': 'Charitable incorporated organisation',
+    'scottish-charitable-incorporated-organisation': 'Scottish charitable incorporated organisation',
+    'scottish-partnership': 'Scottish qualifying partnership',
+    'registered-society-non-jurisdictional': 'Registered society',
+    'industrial-and-provident-society': 'Industrial and provident society',
+    'royal-charter': 'Royal charter company',
+    'uk-establishment': 'UK establishment company',
+    'european-public-limited-liability-company-se': 'European public limited liability company (SE)',
+}
+
+
+class CompaniesHouseAPIError(Exception):
+    pass
+
+
+class KeyScheduler:
+    """
+    Hands out API keys so that no key makes more than limit requests in any
+    window seconds. Each call to acquire() reserves a slot on the key that
+    can send soonest and sleeps until then. Keys the API reports as
+    exhausted (429, or X-Ratelimit-Remain of 0) are parked until their reset time.
+    """
+
+    def __init__(self, keys, limit=RATE_LIMIT, window=RATE_WINDOW):
+        if not keys:
+            raise ValueError("At least one Companies House API key is required")
+        self.keys = list(keys)
+        self.limit = limit
+        self.window = window
+        self._lock = threading.Lock()
+        self._sent = {key: deque() for key in self.keys}
+        self._blocked_until = {key: 0.0 for key in self.keys}
+
+    def _available_at(self, key, now):
+        sent = self._sent[key]
+        while sent and sent[0] <= now - self.window:
+            sent.popleft()
+        at = now if len(sent) < self.limit else sent[0] + self.window
+        return max(at, self._blocked_until[key])
+
+    def reserve(self):
+        """Returns (key, seconds to wait) for the next request and books the slot."""
+        with self._lock:
+            now = time.time()
+            key = min(self.keys, key=lambda k: self._available_at(k, now))
+            at = self._available_at(key, now)
+            self._sent[key].append(at)
+            return key, max(0.0, at - now)
+
+    def acquire(self):
+        """Returns a key, after waiting until it may be used."""
+        key, wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return key
+
+    def block(self, key, until):
+        """Parks a key until the given epoch time."""
+        with self._lock:
+            self._blocked_until[key] = max(self._blocked_until[key], until)
+
+    def update(self, key, headers):
+        """Applies the X-Ratelimit-* headers of a response."""
+        remaining = headers.get('X-Ratelimit-Remain')
+        reset = headers.get('X-Ratelimit-Reset')
+        try:
+            if remaining is not None and int(remaining) <= 0 and reset:
+                self.block(key, float(reset))
+        except ValueError:
+            pass
+
+
+def _format_date(value):
+    """Converts the API's YYYY-MM-DD dates to GOV.UK's '1 March 2015' style."""
+    try:
+        date = datetime.strptime(value, '%Y-%m-%d')
+    except (TypeError, ValueError):
+        return 'N/A'
+    return f"{date.day} {date.strftime('%B %Y')}"
+
+
+def _describe(code):
+    return code.replace('-', ' ').capitalize() if code else 'N/A'
+
+
+class CompaniesHouseAPI:
+    """
+    Thread-safe Companies House API client. keys is a list of API keys
+    (used in rotation); cache, if given, is a ResponseCache-like object with
+    get(url, source, ignore_ttl) and put(url, source, body) used for the
+    JSON bodies. With offline=True only the cache is used; with
+    revalidate=True it is only written, and every call goes to the API.
+    """
+
+    def __init__(self, keys, base_url=API_BASE_URL, limit=RATE_LIMIT, window=RATE_WINDOW,
+                 max_retries=MAX_RETRIES, timeout=30, cache=None, offline=False, revalidate=False):
+        self.base_url = base_url.rstrip('/')
+        self.scheduler = KeyScheduler(keys, limit, window)
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.cache = cache
+        self.offline = offline
+        self.revalidate = revalidate
+        self.requests = 0
+        self._local = threading.local()
+
+    def _session(self):
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = requests.Session()
+            session.headers['Accept'] = 'application/json'
+        return session
+
+    def get(self, path, params=None):
+        """
+        GETs an API path and returns the decoded JSON, or None for a 404
+        (and for anything not cached when offline).
+        Raises CompaniesHouseAPIError once retries are used up.
+        """
+        url = requests.Request('GET', self.base_url + path, params=params).prepare().url
+        if self.cache and (self.offline or not self.revalidate):
+            cached = self.cache.get(url, 'gov_api', ignore_ttl=self.offline)
+            if cached is not None:
+                return json.loads(cached)
+        if self.offline:
+            return None
+
+        # Rate limiting only parks the key, it does not use up an attempt;
+        # MAX_THROTTLES stops a key that is never released from looping forever
+        attempt = throttles = 0
+        while attempt < self.max_retries and throttles < MAX_THROTTLES:
+            key = self.scheduler.acquire()
+            token = base64.b64encode(f"{key}:".encode()).decode()
+            try:
+                self.requests += 1
+                response = self._session().get(url, headers={'Authorization': f"Basic {token}"}, timeout=self.timeout)
+            except requests.exceptions.RequestException as e:
+                logger.warning(f"Companies House API request failed for {url}: {e}")
+                attempt += 1
+                time.sleep(min(60, 2 ** attempt + random.random()))
+                continue
+
+            self.scheduler.update(key, response.headers)
+            if response.status_code == 429:
+                reset = response.headers.get('X-Ratelimit-Reset')
+                until = float(reset) if reset else time.time() + self.scheduler.window
+                # A reset time already passed (clock skew) still parks the key briefly
+                until = max(until, time.time() + 1)
+                throttles += 1
+                logger.warning(f"Companies House API key ...{key[-4:]} rate limited until {datetime.fromtimestamp(until):%H:%M:%S}")
+                self.scheduler.block(key, until)
+                continue
+            if response.status_code == 401:
+                raise CompaniesHouseAPIError(f"Companies House API key ...{key[-4:]} was rejected")
+            if response.status_code == 404:
+                if self.cache:
+                    self.cache.put(url, 'gov_api', 'null')
+                return None
+            if response.status_code >= 500:
+                logger.warning(f"Companies House API error {response.status_code} for {url}")
+                attempt += 1
+                time.sleep(min(60, 2 ** attempt + random.random()))
+                continue
+            response.raise_for_status()
+            if self.cache:
+                self.cache.put(url, 'gov_api', response.text)
+            return response.json()
+
+        raise CompaniesHouseAPIError(f"Giving up on {url} after {attempt} errors and {throttles} rate limit responses")
+
+    def search(self, company_name, items=20):
+        """Returns the API's search result items for a company name."""
+        result = self.get('/search/companies', {'q': company_name, 'items_per_page': items})
+        return (result or {}).get('items', [])
+
+    def profile(self, crn):
+        """Returns the company profile for a CRN (address, status, type, SIC codes), or None."""
+        return self.get(f"/company/{crn.upper()}")
+
+    @staticmethod
+    def to_gov_data(profile, sic_description=None):
+        """
+        Converts a company profile to the fields scrape_gov_uk extracts from
+        the GOV.UK pages. sic_description(code) supplies the text GOV.UK shows
+        after the code; codes it does not know are described from
+        SIC_DESCRIPTIONS. Address splitting and the city lookup are left to the caller.
+        """
+        address = profile.get('registered_office_address') or {}
+        premises_line = ' '.join(filter(None, [address.get('premises'), address.get('address_line_1')]))
+        parts = [address.get('care_of'), address.get('po_box'), premises_line, address.get('address_line_2'),
+                 address.get('locality'), address.get('region'), address.get('country'), address.get('postal_code')]
+        full_address = ', '.join(part.strip() for part in parts if part and part.strip())
+
+        sic = 'N/A'
+        codes = profile.get('sic_codes') or []
+        if codes:
+            description = (sic_description(codes[0]) if sic_description else None) or SIC_DESCRIPTIONS.get(codes[0])
+            sic = f"{codes[0]} - {description}" if description else codes[0]
+
+        return {
+            'full_address': full_address or 'N/A',
+            'crn': profile.get('company_number', 'N/A'),
+            'name': profile.get('company_name', 'N/A'),
+            'incorporation_date': _format_date(profile.get('date_of_creation')),
+            'status': _describe(profile.get('company_status')),
+            'company_type': COMPANY_TYPES.get(profile.get('type'), _describe(profile.get('type'))),
+            'sic': sic,
+        }
+
+
+def keys_from_env(value=None):
+    """Reads comma-separated API keys from CH_API_KEYS."""
+    value = os.environ.get('CH_API_KEYS', '') if value is None else value
+    return [key.strip() for key in value.split(',') if key.strip()]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Look a company up through the Companies House API.")
+    parser.add_argument('key', help="API key (or several, comma-separated)")
+    parser.add_argument('company_name')
+    parser.add_argument('--base-url', default=API_BASE_URL)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    client = CompaniesHouseAPI(keys_from_env(args.key), base_url=args.base_url)
+    items = client.search(args.company_name)
+    if not items:
+        print('Not found')
+        return
+    crn = items[0]['company_number']
+    profile = client.profile(crn)
+    if not profile:
+        print(f"No company profile for {crn}")
+        return
+    print(CompaniesHouseAPI.to_gov_data(profile))
+
+
+if __name__ == "__main__":
+    main()
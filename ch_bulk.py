@@ -0,0 +1,322 @@
+"""
+Local lookup engine built from the Companies House "BasicCompanyData" bulk
+snapshot (https://download.companieshouse.gov.uk/en_output.html).
+
+The multi-GB CSV (or the zip it is published in) is streamed row by row into
+a SQLite database with a full-text index on the company name, so the scraper
+can answer registry questions from disk and only fall back to GOV.UK for
+misses.
+
+    python ch_bulk.py ingest BasicCompanyData-2025-10-01.zip companies.sqlite
+"""
+import argparse
+import contextlib
+import csv
+import io
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import zipfile
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 10000
+
+COLUMNS = [
+    'crn', 'name', 'name_key', 'care_of', 'po_box', 'address_line1', 'address_line2',
+    'post_town', 'county', 'country', 'postcode', 'category', 'status',
+    'incorporation_date', 'sic1', 'sic2', 'sic3', 'sic4',
+]
+
+# BasicCompanyData header -> our column. Some headers carry a leading space
+# in the published files, so headers are stripped before lookup.
+CSV_FIELDS = {
+    'CompanyName': 'name',
+    'CompanyNumber': 'crn',
+    'RegAddress.CareOf': 'care_of',
+    'RegAddress.POBox': 'po_box',
+    'RegAddress.AddressLine1': 'address_line1',
+    'RegAddress.AddressLine2': 'address_line2',
+    'RegAddress.PostTown': 'post_town',
+    'RegAddress.County': 'county',
+    'RegAddress.Country': 'country',
+    'RegAddress.PostCode': 'postcode',
+    'CompanyCategory': 'category',
+    'CompanyStatus': 'status',
+    'IncorporationDate': 'incorporation_date',
+    'SICCode.SicText_1': 'sic1',
+    'SICCode.SicText_2': 'sic2',
+    'SICCode.SicText_3': 'sic3',
+    'SICCode.SicText_4': 'sic4',
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS companies (
+    crn TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    name_key TEXT NOT NULL,
+    care_of TEXT, po_box TEXT, address_line1 TEXT, address_line2 TEXT,
+    post_town TEXT, county TEXT, country TEXT, postcode TEXT,
+    category TEXT, status TEXT, incorporation_date TEXT,
+    sic1 TEXT, sic2 TEXT, sic3 TEXT, sic4 TEXT
+);
+CREATE INDEX IF NOT EXISTS companies_name_key ON companies (name_key);
+CREATE VIRTUAL TABLE IF NOT EXISTS companies_fts USING fts5(
+    name, content='companies', content_rowid='rowid'
+);
+CREATE TABLE IF NOT EXISTS sic_codes (
+    code TEXT PRIMARY KEY,
+    description TEXT NOT NULL
+);
+"""
+
+
+def name_key(name):
+    """Exact-match key for a company name: upper case, '&' as AND, no punctuation."""
+    key = name.upper().replace('&', ' AND ')
+    key = re.sub(r'[^A-Z0-9 ]', ' ', key)
+    return ' '.join(key.split())
+
+
+def _open_csv(path):
+    """Opens the bulk CSV as text, reading the first CSV member of a zip without extracting it."""
+    if zipfile.is_zipfile(path):
+        archive = zipfile.ZipFile(path)
+        member = next(n for n in archive.namelist() if n.lower().endswith('.csv'))
+        return io.TextIOWrapper(archive.open(member), encoding='utf-8', newline='')
+    return open(path, encoding='utf-8', newline='')
+
+
+def _rows(reader):
+    header = [h.strip() for h in next(reader)]
+    positions = {CSV_FIELDS[h]: i for i, h in enumerate(header) if h in CSV_FIELDS}
+    for record in reader:
+        row = {col: (record[i].strip() if i < len(record) else '') for col, i in positions.items()}
+        if not row.get('crn') or not row.get('name'):
+            continue
+        row['name_key'] = name_key(row['name'])
+        yield row
+
+
+def ingest(csv_path, db_path, batch_size=BATCH_SIZE):
+    """
+    Streams a BasicCompanyData CSV (or zip) into db_path in batches, so memory
+    use does not depend on the file size. Re-ingesting a newer snapshot into
+    the same database replaces existing companies by CRN. Returns the number
+    of rows read.
+    """
+    db = sqlite3.connect(db_path)
+    db.execute("PRAGMA journal_mode = OFF")
+    db.execute("PRAGMA synchronous = OFF")
+    db.executescript(SCHEMA)
+
+    insert_company = "INSERT OR REPLACE INTO companies ({}) VALUES ({})".format(
+        ', '.join(COLUMNS), ', '.join('?' * len(COLUMNS))
+    )
+    insert_sic = "INSERT OR IGNORE INTO sic_codes (code, description) VALUES (?, ?)"
+
+    count = 0
+    batch = []
+    sic_batch = set()
+    with _open_csv(csv_path) as f:
+        for row in _rows(csv.reader(f)):
+            batch.append([row.get(col, '') for col in COLUMNS])
+            for col in ('sic1', 'sic2', 'sic3', 'sic4'):
+                code, _, description = row.get(col, '').partition(' - ')
+                if description:
+                    sic_batch.add((code.strip(), description.strip()))
+            if len(batch) >= batch_size:
+                db.executemany(insert_company, batch)
+                db.executemany(insert_sic, sic_batch)
+                db.commit()
+                count += len(batch)
+                batch = []
+                sic_batch = set()
+                logger.info(f"Ingested {count} companies")
+        if batch:
+            db.executemany(insert_company, batch)
+            db.executemany(insert_sic, sic_batch)
+            count += len(batch)
+
+    logger.info("Building name index")
+    db.execute("INSERT INTO companies_fts (companies_fts) VALUES ('rebuild')")
+    db.commit()
+    db.execute("VACUUM")
+    db.close()
+    logger.info(f"Ingested {count} companies into {db_path}")
+    return count
+
+
+def _format_date(value):
+    """Converts the bulk file's DD/MM/YYYY dates to GOV.UK's '1 March 2015' style."""
+    try:
+        date = datetime.strptime(value, '%d/%m/%Y')
+    except (TypeError, ValueError):
+        return 'N/A'
+    return f"{date.day} {date.strftime('%B %Y')}"
+
+
+def _fts_query(company_name, alternatives=None):
+    """
+    Builds an FTS5 query requiring every word of the name, quoted to escape
+    FTS syntax. alternatives maps a lower-case word to the spellings any of
+    which may stand for it.
+    """
+    alternatives = alternatives or {}
+    terms = []
+    for word in re.findall(r'[A-Za-z0-9]+', company_name.replace('&', ' and ')):
+        spellings = alternatives.get(word.lower(), (word,))
+        if len(spellings) > 1:
+            terms.append('(' + ' OR '.join(f'"{spelling}"' for spelling in spellings) + ')')
+        else:
+            terms.append(f'"{spellings[0]}"')
+    return ' AND '.join(terms)
+
+
+class CompaniesHouseStore:
+    """Read-only lookups against a database built by ingest(). Safe to share between threads."""
+
+    def __init__(self, db_path):
+        if not os.path.exists(db_path):
+            raise FileNotFoundError(db_path)
+        self.db_path = db_path
+        self._local = threading.local()
+
+    def _db(self):
+        db = getattr(self._local, 'db', None)
+        if db is None:
+            db = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True)
+            db.row_factory = sqlite3.Row
+            self._local.db = db
+        return db
+
+    def get(self, crn):
+        """Returns the company row for a CRN, or None."""
+        return self._db().execute("SELECT * FROM companies WHERE crn = ?", (crn.upper(),)).fetchone()
+
+    def candidates(self, company_name, limit=20, alternatives=None):
+        """
+        Returns up to limit company rows whose names contain every word of
+        company_name (or one of its alternatives, see _fts_query), best FTS rank first.
+        """
+        query = _fts_query(company_name, alternatives)
+        if not query:
+            return []
+        return self._db().execute(
+            "SELECT c.* FROM companies_fts f JOIN companies c ON c.rowid = f.rowid "
+            "WHERE companies_fts MATCH ? ORDER BY f.rank LIMIT ?",
+            (query, limit)
+        ).fetchall()
+
+    def candidates_batch(self, company_names, limit=20, alternatives=None):
+        """
+        Returns candidates() for each name, all read with one query (the
+        names' FTS queries are passed in as a JSON array and joined against the index).
+        """
+        queries = [_fts_query(name, alternatives) for name in company_names]
+        results = [[] for _ in queries]
+        wanted = [index for index, query in enumerate(queries) if query]
+        if not wanted:
+            return results
+        rows = self._db().execute(
+            "WITH q(idx, query) AS (SELECT key, value FROM json_each(?)) "
+            "SELECT m.idx, c.* FROM ("
+            "    SELECT q.idx, f.rowid AS id, row_number() OVER (PARTITION BY q.idx ORDER BY f.rank) AS n"
+            "    FROM q JOIN companies_fts f ON f.companies_fts MATCH q.query"
+            ") m JOIN companies c ON c.rowid = m.id WHERE m.n <= ? ORDER BY m.idx, m.n",
+            (json.dumps([queries[index] for index in wanted]), limit)
+        )
+        for row in rows:
+            results[wanted[row['idx']]].append(row)
+        return results
+
+    def exact(self, company_name):
+        """Returns the rows with exactly the same normalized name, active companies first."""
+        return self._db().execute(
+            "SELECT * FROM companies WHERE name_key = ? ORDER BY status = 'Active' DESC",
+            (name_key(company_name),)
+        ).fetchall()
+
+    def exact_batch(self, company_names):
+        """Returns exact() for each name, all read with one query."""
+        keys = [name_key(name) for name in company_names]
+        by_key = {}
+        rows = self._db().execute(
+            "SELECT * FROM companies WHERE name_key IN (SELECT value FROM json_each(?)) ORDER BY status = 'Active' DESC",
+            (json.dumps(sorted(set(keys))),)
+        )
+        for row in rows:
+            by_key.setdefault(row['name_key'], []).append(row)
+        return [by_key.get(key, []) for key in keys]
+
+    @contextlib.contextmanager
+    def read_transaction(self):
+        """Runs the lookups made inside it in one read transaction, against one view of the database."""
+        db = self._db()
+        db.execute("BEGIN")
+        try:
+            yield self
+        finally:
+            db.execute("COMMIT")
+
+    def find(self, company_name):
+        """Returns the row with exactly the same normalized name, else the best full-text hit, else None."""
+        rows = self.exact(company_name)
+        if rows:
+            return rows[0]
+        rows = self.candidates(company_name, limit=1)
+        return rows[0] if rows else None
+
+    def sic_description(self, code):
+        """Returns the description for a SIC code seen in the snapshot, or None."""
+        row = self._db().execute("SELECT description FROM sic_codes WHERE code = ?", (code,)).fetchone()
+        return row[0] if row else None
+
+    @staticmethod
+    def to_gov_data(row):
+        """
+        Converts a company row to the fields scrape_gov_uk extracts from the
+        GOV.UK pages. Address splitting and the city lookup are left to the caller.
+        """
+        address_parts = [
+            row['care_of'], row['po_box'], row['address_line1'], row['address_line2'],
+            row['post_town'], row['county'], row['country'], row['postcode'],
+        ]
+        full_address = ', '.join(part for part in address_parts if part)
+        sic = row['sic1'] if row['sic1'] and row['sic1'] != 'None Supplied' else 'N/A'
+        return {
+            'full_address': full_address or 'N/A',
+            'crn': row['crn'],
+            'name': row['name'],
+            'incorporation_date': _format_date(row['incorporation_date']),
+            'status': row['status'] or 'N/A',
+            'company_type': row['category'].capitalize() if row['category'] else 'N/A',
+            'sic': sic,
+        }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Companies House bulk snapshot tools.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    ingest_parser = subparsers.add_parser('ingest', help="Load a BasicCompanyData CSV or zip into a SQLite store")
+    ingest_parser.add_argument('csv_path')
+    ingest_parser.add_argument('db_path')
+    lookup_parser = subparsers.add_parser('lookup', help="Look a company name up in a store")
+    lookup_parser.add_argument('db_path')
+    lookup_parser.add_argument('company_name')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    if args.command == 'ingest':
+        ingest(args.csv_path, args.db_path)
+    else:
+        row = CompaniesHouseStore(args.db_path).find(args.company_name)
+        print(CompaniesHouseStore.to_gov_data(row) if row else 'Not found')
+
+
+if __name__ == "__main__":
+    main()
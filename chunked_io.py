@@ -0,0 +1,122 @@
+"""
+Chunked reading of company lists and incremental writing of results, so a
+run over hundreds of thousands of companies never holds the whole input or
+output in memory. pandas is imported on first use.
+"""
+import os
+
+
+def read_chunks(path, chunksize):
+    """
+    Yields the input .csv or .xlsx as DataFrames of up to chunksize rows.
+    The index keeps counting across chunks, the same row numbers a full
+    pd.read_csv/pd.read_excel would give.
+    """
+    import pandas as pd
+
+    if path.endswith('.csv'):
+        yield from pd.read_csv(path, chunksize=chunksize)
+    elif path.endswith('.xlsx'):
+        yield from _read_excel_chunks(path, chunksize)
+    else:
+        raise ValueError("Input file must be .csv or .xlsx")
+
+
+def _read_excel_chunks(path, chunksize):
+    import pandas as pd
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        columns = [str(c) if c is not None else f"Unnamed: {i}" for i, c in enumerate(header)]
+        values, index = [], []
+        for number, row in enumerate(rows):
+            # Read-only sheets report formatted but empty rows, pandas skips those
+            if all(value is None for value in row):
+                continue
+            values.append(list(row[:len(columns)]) + [None] * (len(columns) - len(row)))
+            index.append(number)
+            if len(values) >= chunksize:
+                yield pd.DataFrame(values, columns=columns, index=index)
+                values, index = [], []
+        if values:
+            yield pd.DataFrame(values, columns=columns, index=index)
+    finally:
+        workbook.close()
+
+
+def order_columns(original_columns, result_columns):
+    """Output column order: input columns the results fill first, then the other result columns."""
+    original = [col for col in original_columns if col in result_columns]
+    return original + [col for col in result_columns if col not in original]
+
+
+class ChunkedWriter:
+    """
+    Writes result rows to .csv, .parquet or .xlsx as they arrive. Excel output
+    uses openpyxl's write-only mode, which streams rows to a temporary file
+    instead of keeping the sheet in memory; Parquet needs pyarrow.
+    """
+
+    def __init__(self, path, columns):
+        self.path = path
+        self.columns = list(columns)
+        self.rows_written = 0
+        self._tmp_path = path + '.tmp'
+        self._file = None
+        self._workbook = None
+        self._sheet = None
+        self._parquet = None
+
+        if path.endswith('.csv'):
+            import pandas as pd
+
+            self._file = open(self._tmp_path, 'w', encoding='utf-8', newline='')
+            pd.DataFrame(columns=self.columns).to_csv(self._file, index=False)
+        elif path.endswith('.parquet'):
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            self._schema = pa.schema([(col, pa.string()) for col in self.columns])
+            self._parquet = pq.ParquetWriter(self._tmp_path, self._schema)
+        elif path.endswith('.xlsx'):
+            from openpyxl import Workbook
+
+            self._workbook = Workbook(write_only=True)
+            self._sheet = self._workbook.create_sheet()
+            self._sheet.append(self.columns)
+        else:
+            raise ValueError("Output file must be .csv, .parquet or .xlsx")
+
+    def write(self, results):
+        """Appends a list of result dicts, in order."""
+        import pandas as pd
+
+        if not results:
+            return
+        frame = pd.DataFrame(results).reindex(columns=self.columns)
+        if self._file is not None:
+            frame.to_csv(self._file, index=False, header=False)
+        elif self._parquet is not None:
+            import pyarrow as pa
+
+            frame = frame.astype(object).where(frame.notna(), None)
+            self._parquet.write_table(pa.Table.from_pandas(frame, schema=self._schema, preserve_index=False))
+        else:
+            for row in frame.itertuples(index=False):
+                self._sheet.append([None if pd.isna(value) else value for value in row])
+        self.rows_written += len(frame)
+
+    def close(self):
+        """Finishes the file and moves it into place."""
+        if self._file is not None:
+            self._file.close()
+        elif self._parquet is not None:
+            self._parquet.close()
+        else:
+            self._workbook.save(self._tmp_path)
+        os.replace(self._tmp_path, self.path)
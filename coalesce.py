@@ -0,0 +1,84 @@
+import threading
+from collections import OrderedDict
+
+
+class SingleFlight:
+    """
+    Runs a function at most once per key at a time.
+
+    Threads asking for a key that is already being computed wait for that
+    call and share its result instead of repeating the work. Results are
+    also remembered (up to max_entries, least recently used dropped first),
+    so later calls with the same key return straight away; max_entries=0
+    only coalesces concurrent calls. A result that remember(value) rejects
+    is neither remembered nor shared: each waiting thread runs fn() itself.
+    An exception is raised in every waiting thread and nothing is remembered.
+    """
+
+    def __init__(self, max_entries=100000):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.shared = 0
+        self._lock = threading.Lock()
+        self._results = OrderedDict()
+        self._in_flight = {}
+
+    def do(self, key, fn, remember=lambda value: True):
+        """Returns fn() for key, reusing a remembered or in-flight result. remember(value) decides what is reused."""
+        with self._lock:
+            if key in self._results:
+                self._results.move_to_end(key)
+                self.hits += 1
+                return self._results[key]
+            call = self._in_flight.get(key)
+            leader = call is None
+            if leader:
+                call = self._in_flight[key] = _Call()
+            else:
+                self.shared += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            if call.reusable:
+                return call.value
+            with self._lock:
+                self.shared -= 1
+            return fn()
+
+        try:
+            call.value = fn()
+            call.reusable = remember(call.value)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+                if call.reusable and self.max_entries:
+                    self._store(key, call.value)
+            call.done.set()
+        return call.value
+
+    def seed(self, key, value):
+        """Remembers a result computed elsewhere, e.g. in an earlier run."""
+        if self.max_entries:
+            with self._lock:
+                self._store(key, value)
+
+    def _store(self, key, value):
+        self._results[key] = value
+        self._results.move_to_end(key)
+        while len(self._results) > self.max_entries:
+            self._results.popitem(last=False)
+
+
+class _Call:
+    __slots__ = ('done', 'value', 'error', 'reusable')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+        self.reusable = False
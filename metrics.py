@@ -0,0 +1,209 @@
+"""
+In-process run metrics: latency histograms, counters and gauges keyed by a
+name and labels (host, stage, ...). Summaries are written as JSON and,
+optionally, in the Prometheus text exposition format, e.g. for node
+exporter's textfile collector.
+"""
+import functools
+import json
+import os
+import threading
+import time
+
+# Seconds; roughly 1-2.5-5 steps from 1ms to 2 minutes
+DEFAULT_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+    1, 2.5, 5, 10, 25, 60, 120,
+)
+
+
+class Histogram:
+    """Cumulative-bucket histogram that also keeps count, sum, min and max."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.count += 1
+        self.sum += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def quantile(self, q):
+        """Estimates a quantile by linear interpolation inside its bucket."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        lower = 0.0
+        for bound, count in zip(self.buckets + (self.max,), self.counts):
+            if count and seen + count >= rank:
+                upper = min(bound, self.max)
+                lower = max(lower, self.min)
+                return lower + (upper - lower) * (rank - seen) / count
+            seen += count
+            lower = bound
+        return self.max
+
+    def summary(self):
+        return {
+            'count': self.count,
+            'sum': round(self.sum, 6),
+            'mean': round(self.sum / self.count, 6) if self.count else None,
+            'min': self.min,
+            'max': self.max,
+            'p50': self.quantile(0.5),
+            'p90': self.quantile(0.9),
+            'p99': self.quantile(0.99),
+        }
+
+
+def _key(name, labels):
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _label_text(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{k}="{v}"' for k, v in pairs) + '}'
+
+
+class Metrics:
+    """Thread-safe registry of histograms, counters and gauges."""
+
+    def __init__(self, prefix='scraper'):
+        self.prefix = prefix
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self._counters = {}
+        self._gauges = {}
+
+    def observe(self, name, value, **labels):
+        """Adds a value (normally seconds) to the histogram name{labels}."""
+        key = _key(name, labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(value)
+
+    def inc(self, name, amount=1, **labels):
+        """Increments the counter name{labels}."""
+        key = _key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def set(self, name, value, **labels):
+        """Sets the gauge name{labels}."""
+        with self._lock:
+            self._gauges[_key(name, labels)] = value
+
+    def counter(self, name, **labels):
+        """Returns the sum of every name counter whose labels include labels."""
+        wanted = set(_key(name, labels)[1])
+        with self._lock:
+            return sum(v for (n, l), v in self._counters.items() if n == name and wanted <= set(l))
+
+    def timer(self, name, **labels):
+        """Context manager that observes its wall time in name{labels}."""
+        return _Timer(self, name, labels)
+
+    def timed(self, name, **labels):
+        """Decorator version of timer()."""
+        def decorator(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                with self.timer(name, **labels):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def summary(self):
+        """Returns every metric as a JSON-serializable dict."""
+        with self._lock:
+            def grouped(items, convert):
+                out = {}
+                for (name, labels), value in sorted(items):
+                    out.setdefault(name, []).append({'labels': dict(labels), 'value': convert(value)})
+                return out
+            return {
+                'started': self.started,
+                'elapsed_seconds': round(time.time() - self.started, 3),
+                'histograms': grouped(self._histograms.items(), Histogram.summary),
+                'counters': grouped(self._counters.items(), lambda v: v),
+                'gauges': grouped(self._gauges.items(), lambda v: v),
+            }
+
+    def prometheus_text(self):
+        """Renders the metrics in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            typed = set()
+
+            def header(name, kind):
+                if name not in typed:
+                    typed.add(name)
+                    lines.append(f"# TYPE {name} {kind}")
+
+            for (name, labels), histogram in sorted(self._histograms.items()):
+                full = f"{self.prefix}_{name}"
+                header(full, 'histogram')
+                cumulative = 0
+                for bound, count in zip(histogram.buckets, histogram.counts):
+                    cumulative += count
+                    lines.append(f"{full}_bucket{_label_text(labels, [('le', bound)])} {cumulative}")
+                lines.append(f"{full}_bucket{_label_text(labels, [('le', '+Inf')])} {histogram.count}")
+                lines.append(f"{full}_sum{_label_text(labels)} {histogram.sum}")
+                lines.append(f"{full}_count{_label_text(labels)} {histogram.count}")
+            for (name, labels), value in sorted(self._counters.items()):
+                full = f"{self.prefix}_{name}"
+                header(full, 'counter')
+                lines.append(f"{full}{_label_text(labels)} {value}")
+            for (name, labels), value in sorted(self._gauges.items()):
+                full = f"{self.prefix}_{name}"
+                header(full, 'gauge')
+                lines.append(f"{full}{_label_text(labels)} {value}")
+        return '\n'.join(lines) + '\n'
+
+    def write_json(self, path):
+        _write_atomic(path, json.dumps(self.summary(), indent=2))
+
+    def write_prometheus(self, path):
+        _write_atomic(path, self.prometheus_text())
+
+
+class _Timer:
+    __slots__ = ('metrics', 'name', 'labels', 'start')
+
+    def __init__(self, metrics, name, labels):
+        self.metrics = metrics
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.metrics.observe(self.name, time.perf_counter() - self.start, **self.labels)
+        return False
+
+
+def _write_atomic(path, text):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
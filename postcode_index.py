@@ -0,0 +1,231 @@
+"""
+Postcode -> locality lookup from a full postcode list, such as the ONS
+Postcode Directory (https://geoportal.statistics.gov.uk/, search "ONSPD")
+joined to place names, or any CSV with a postcode and a locality column.
+
+The CSV is compiled once into a small binary file of fixed-width records
+sorted by postcode, plus one record per outward code (the locality most of
+its postcodes have). Lookups binary-search the memory-mapped file, so they
+take O(log n) and only the pages touched are read in; opening the index
+costs no memory whatever its size.
+
+    python postcode_index.py build ONSPD_FEB_2025_UK.csv postcodes.idx --locality-column town
+    python postcode_index.py lookup postcodes.idx "SW1A 1AA"
+"""
+import argparse
+import csv
+import io
+import logging
+import mmap
+import re
+import struct
+import zipfile
+from collections import Counter
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'UKPC'
+VERSION = 1
+HEADER = struct.Struct('<4sHIII') # magic, version, postcodes, outward codes, localities
+POSTCODE_WIDTH = 7 # 'SW1A1AA', the longest postcode without its space
+OUTWARD_WIDTH = 4 # 'SW1A'
+LOCALITY = struct.Struct('<I') # index into the locality table
+
+# Header names tried when no column is given, in order
+POSTCODE_COLUMNS = ('pcds', 'pcd', 'pcd2', 'postcode', 'Postcode', 'PostCode', 'POSTCODE')
+LOCALITY_COLUMNS = ('locality', 'Locality', 'town', 'Town', 'post_town', 'PostTown', 'city', 'City')
+
+_NOT_ALNUM = re.compile(r'[^A-Z0-9]')
+
+
+def normalize_postcode(postcode):
+    """'sw1a 1aa' -> 'SW1A1AA'. Returns '' for anything that is not a string."""
+    if not isinstance(postcode, str):
+        return ''
+    return _NOT_ALNUM.sub('', postcode.upper())
+
+
+def outward_code(compact):
+    """The outward code of a normalized postcode; a short fragment is taken as one already."""
+    return compact[:-3] if len(compact) >= 5 else compact
+
+
+def _open_csv(path):
+    """Opens a CSV, or the largest CSV inside a zip (the data file of an ONSPD download)."""
+    if path.endswith('.zip'):
+        archive = zipfile.ZipFile(path)
+        member = max((info for info in archive.infolist() if info.filename.lower().endswith('.csv')),
+                     key=lambda info: info.file_size)
+        return io.TextIOWrapper(archive.open(member), encoding='utf-8-sig', newline='')
+    return open(path, encoding='utf-8-sig', newline='')
+
+
+def _pick_column(header, column, candidates, what):
+    if column:
+        if column not in header:
+            raise ValueError(f"No {what} column '{column}' in {header}")
+        return header.index(column)
+    for candidate in candidates:
+        if candidate in header:
+            return header.index(candidate)
+    raise ValueError(f"No {what} column found in {header}, pick one with --{what}-column")
+
+
+def build(csv_path, index_path, postcode_column=None, locality_column=None):
+    """
+    Compiles a postcode CSV (or zip) into an index file. Rows without a
+    locality are skipped; a postcode listed twice keeps its first locality.
+    Returns (postcodes, outward codes) written.
+    """
+    localities = {}
+    records = []
+    outward_votes = {}
+    with _open_csv(csv_path) as f:
+        reader = csv.reader(f)
+        header = [name.strip() for name in next(reader)]
+        postcode_at = _pick_column(header, postcode_column, POSTCODE_COLUMNS, 'postcode')
+        locality_at = _pick_column(header, locality_column, LOCALITY_COLUMNS, 'locality')
+        for count, row in enumerate(reader, 1):
+            if len(row) <= max(postcode_at, locality_at):
+                continue
+            compact = normalize_postcode(row[postcode_at])
+            locality = row[locality_at].strip()
+            if not (5 <= len(compact) <= POSTCODE_WIDTH) or not locality:
+                continue
+            number = localities.setdefault(locality, len(localities))
+            # One bytes object per postcode: sorting them sorts by postcode
+            records.append(compact.encode('ascii').ljust(POSTCODE_WIDTH) + LOCALITY.pack(number))
+            outward_votes.setdefault(outward_code(compact), Counter())[number] += 1
+            if count % 500000 == 0:
+                logger.info(f"Read {count} postcodes")
+
+    records.sort()
+    unique = []
+    for record in records:
+        if not unique or unique[-1][:POSTCODE_WIDTH] != record[:POSTCODE_WIDTH]:
+            unique.append(record)
+    outwards = sorted(
+        outward.encode('ascii').ljust(OUTWARD_WIDTH) + LOCALITY.pack(votes.most_common(1)[0][0])
+        for outward, votes in outward_votes.items() if len(outward) <= OUTWARD_WIDTH
+    )
+
+    names = [name.encode('utf-8') for name in sorted(localities, key=localities.get)]
+    offsets = [0]
+    for name in names:
+        offsets.append(offsets[-1] + len(name))
+
+    with open(index_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(unique), len(outwards), len(names)))
+        f.write(b''.join(unique))
+        f.write(b''.join(outwards))
+        f.write(struct.pack(f'<{len(offsets)}I', *offsets))
+        f.write(b''.join(names))
+    logger.info(f"Wrote {len(unique)} postcodes, {len(outwards)} outward codes and {len(names)} localities to {index_path}")
+    return len(unique), len(outwards)
+
+
+class PostcodeIndex:
+    """
+    Read-only view of an index built by build(). lookup() takes a postcode
+    in any spacing or case and returns its locality: the postcode's own, else
+    that of its outward code, else None. Safe to share between threads.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.postcodes, self.outwards, self.localities = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a postcode index (version {VERSION})")
+        self._postcodes_at = HEADER.size
+        self._outwards_at = self._postcodes_at + self.postcodes * (POSTCODE_WIDTH + LOCALITY.size)
+        self._offsets_at = self._outwards_at + self.outwards * (OUTWARD_WIDTH + LOCALITY.size)
+        self._names_at = self._offsets_at + (self.localities + 1) * 4
+        self._names = {}
+
+    def _search(self, start, count, width, key):
+        """Binary search over count records of width-byte keys; returns the locality number or None."""
+        size = width + LOCALITY.size
+        low, high = 0, count
+        while low < high:
+            middle = (low + high) // 2
+            at = start + middle * size
+            found = self._map[at:at + width]
+            if found < key:
+                low = middle + 1
+            elif found > key:
+                high = middle
+            else:
+                return LOCALITY.unpack_from(self._map, at + width)[0]
+        return None
+
+    def _locality(self, number):
+        name = self._names.get(number)
+        if name is None:
+            start, end = struct.unpack_from('<2I', self._map, self._offsets_at + number * 4)
+            name = self._names[number] = self._map[self._names_at + start:self._names_at + end].decode('utf-8')
+        return name
+
+    def lookup(self, postcode):
+        """The locality of a postcode (or of its outward code), or None."""
+        compact = normalize_postcode(postcode)
+        if not compact:
+            return None
+        number = None
+        if 5 <= len(compact) <= POSTCODE_WIDTH:
+            number = self._search(self._postcodes_at, self.postcodes, POSTCODE_WIDTH,
+                                  compact.encode('ascii').ljust(POSTCODE_WIDTH))
+        if number is None:
+            outward = outward_code(compact)
+            if len(outward) <= OUTWARD_WIDTH:
+                number = self._search(self._outwards_at, self.outwards, OUTWARD_WIDTH,
+                                      outward.encode('ascii').ljust(OUTWARD_WIDTH))
+        return self._locality(number) if number is not None else None
+
+    def lookup_many(self, postcodes):
+        """lookup() over a whole column: returns a list in the same order, each distinct postcode looked up once."""
+        found = {}
+        results = []
+        for postcode in postcodes:
+            key = normalize_postcode(postcode)
+            if key not in found:
+                found[key] = self.lookup(key)
+            results.append(found[key])
+        return results
+
+    def close(self):
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Postcode to locality index tools.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    build_parser = subparsers.add_parser('build', help="Compile a postcode CSV (or zip) into an index file")
+    build_parser.add_argument('csv_path')
+    build_parser.add_argument('index_path')
+    build_parser.add_argument('--postcode-column', help=f"Default: the first of {', '.join(POSTCODE_COLUMNS)}")
+    build_parser.add_argument('--locality-column', help=f"Default: the first of {', '.join(LOCALITY_COLUMNS)}")
+    lookup_parser = subparsers.add_parser('lookup', help="Look postcodes up in an index")
+    lookup_parser.add_argument('index_path')
+    lookup_parser.add_argument('postcodes', nargs='+')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    if args.command == 'build':
+        build(args.csv_path, args.index_path, args.postcode_column, args.locality_column)
+    else:
+        with PostcodeIndex(args.index_path) as index:
+            for postcode in args.postcodes:
+                print(f"{postcode}: {index.lookup(postcode) or 'Not found'}")
+
+
+if __name__ == "__main__":
+    main()
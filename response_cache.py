@@ -0,0 +1,199 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+
+def normalize_url(url):
+    """
+    Normalizes a URL into a stable cache key: lower-case scheme and host,
+    sorted query parameters and no fragment. '+' and '%20' in the query are
+    treated the same.
+    """
+    parts = urlsplit(url.strip())
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    path = parts.path or '/'
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, query, ''))
+
+
+class ResponseCache:
+    """
+    On-disk HTTP response cache.
+
+    Bodies are zlib-compressed and stored once per content hash under
+    objects/, so identical pages share a file. A small SQLite index maps
+    normalized URLs to bodies and keeps the fetch and last-access times
+    used for per-source TTLs and LRU eviction once max_bytes is exceeded,
+    plus the ETag/Last-Modified validators used to revalidate expired
+    entries with conditional requests.
+    """
+
+    def __init__(self, directory, ttls=None, max_bytes=1024 ** 3, default_ttl=7 * 24 * 3600):
+        self.directory = directory
+        self.ttls = dict(ttls or {})
+        self.default_ttl = default_ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+        os.makedirs(os.path.join(directory, 'objects'), exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(os.path.join(directory, 'index.sqlite'), check_same_thread=False)
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                source TEXT NOT NULL,
+                body_hash TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                last_access REAL NOT NULL,
+                etag TEXT,
+                last_modified TEXT
+            );
+            CREATE TABLE IF NOT EXISTS blobs (
+                hash TEXT PRIMARY KEY,
+                size INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access);
+        """)
+        # Caches created before validators were stored
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(entries)")}
+        for column in ('etag', 'last_modified'):
+            if column not in columns:
+                self._db.execute(f"ALTER TABLE entries ADD COLUMN {column} TEXT")
+        self._db.commit()
+
+    def _blob_path(self, body_hash):
+        return os.path.join(self.directory, 'objects', body_hash[:2], body_hash + '.zlib')
+
+    def _ttl(self, source):
+        return self.ttls.get(source, self.default_ttl)
+
+    def get(self, url, source, ignore_ttl=False):
+        """Returns the cached body for a URL, or None if missing or older than the source TTL."""
+        key = normalize_url(url)
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT body_hash, fetched_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if not row or (not ignore_ttl and now - row[1] > self._ttl(source)):
+                self.misses += 1
+                return None
+            body = self._read_blob(key, row[0])
+            if body is None:
+                self.misses += 1
+                return None
+            self._db.execute("UPDATE entries SET last_access = ? WHERE key = ?", (now, key))
+            self._db.commit()
+            self.hits += 1
+            return body
+
+    def _read_blob(self, key, body_hash):
+        try:
+            with open(self._blob_path(body_hash), 'rb') as f:
+                return zlib.decompress(f.read()).decode('utf-8')
+        except (OSError, zlib.error):
+            # Index points at a missing or damaged blob: forget the blob and every
+            # entry sharing it, so the next put of the same body writes it again
+            self._db.execute("DELETE FROM entries WHERE body_hash = ?", (body_hash,))
+            self._db.execute("DELETE FROM blobs WHERE hash = ?", (body_hash,))
+            self._db.commit()
+            try:
+                os.remove(self._blob_path(body_hash))
+            except OSError:
+                pass
+            return None
+
+    def validators(self, url):
+        """
+        Returns {'etag': ..., 'last_modified': ...} for a cached URL that has
+        either, whatever its age, so an expired entry can be revalidated; else None.
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT etag, last_modified FROM entries WHERE key = ?", (normalize_url(url),)
+            ).fetchone()
+        if not row or not (row[0] or row[1]):
+            return None
+        return {'etag': row[0], 'last_modified': row[1]}
+
+    def revalidate(self, url):
+        """Marks a cached URL as fetched now (after a 304) and returns its body, or None if it is gone."""
+        key = normalize_url(url)
+        now = time.time()
+        with self._lock:
+            row = self._db.execute("SELECT body_hash FROM entries WHERE key = ?", (key,)).fetchone()
+            if not row:
+                return None
+            body = self._read_blob(key, row[0])
+            if body is not None:
+                self._db.execute("UPDATE entries SET fetched_at = ?, last_access = ? WHERE key = ?", (now, now, key))
+                self._db.commit()
+            return body
+
+    def put(self, url, source, body, etag=None, last_modified=None):
+        """Stores a response body (and its validators) for a URL and evicts old entries if over the size limit."""
+        key = normalize_url(url)
+        raw = body.encode('utf-8')
+        body_hash = hashlib.sha256(raw).hexdigest()
+        now = time.time()
+        with self._lock:
+            path = self._blob_path(body_hash)
+            known = self._db.execute("SELECT 1 FROM blobs WHERE hash = ?", (body_hash,)).fetchone()
+            if not known or not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                compressed = zlib.compress(raw, 6)
+                tmp_path = path + '.tmp'
+                with open(tmp_path, 'wb') as f:
+                    f.write(compressed)
+                os.replace(tmp_path, path)
+                self._db.execute("INSERT OR REPLACE INTO blobs (hash, size) VALUES (?, ?)", (body_hash, len(compressed)))
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries (key, source, body_hash, fetched_at, last_access, etag, last_modified) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, source, body_hash, now, now, etag, last_modified)
+            )
+            self._evict()
+            self._db.commit()
+
+    def _drop_orphan_blobs(self):
+        orphans = self._db.execute(
+            "SELECT hash FROM blobs WHERE hash NOT IN (SELECT body_hash FROM entries)"
+        ).fetchall()
+        for (body_hash,) in orphans:
+            try:
+                os.remove(self._blob_path(body_hash))
+            except OSError:
+                pass
+            self._db.execute("DELETE FROM blobs WHERE hash = ?", (body_hash,))
+
+    def _evict(self):
+        """
+        Deletes least recently used entries once the stored bodies exceed
+        max_bytes, freeing down to 90% of the limit so eviction does not run
+        on every write.
+        """
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        excess = total - int(self.max_bytes * 0.9)
+        freed = 0
+        victims = []
+        rows = self._db.execute(
+            "SELECT e.key, b.size FROM entries e JOIN blobs b ON b.hash = e.body_hash ORDER BY e.last_access"
+        ).fetchall()
+        for key, size in rows:
+            if freed >= excess:
+                break
+            victims.append((key,))
+            freed += size
+        self._db.executemany("DELETE FROM entries WHERE key = ?", victims)
+        self._drop_orphan_blobs()
+
+    def close(self):
+        """Closes the index database."""
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,158 @@
+"""
+Compact in-memory table of result rows, for building the output of a large
+run without holding one dict per company.
+
+Values are stored per column. A column stays a single value with a row
+count for as long as every row has the same value (the empty QA and
+researcher columns, the run's date), so it costs nothing per row until
+written. Columns with few distinct strings (City, Sector, status and type)
+store one small integer code per row against a list of the distinct
+values, and become pandas categoricals. Every other column is a plain list,
+in which the 'N/A' placeholders all point at one string (rows read back
+from JSON otherwise carry their own copy of each).
+"""
+from array import array
+
+CATEGORICAL_COLUMNS = ('City', 'Sector', 'Company Status', 'Company Type')
+
+# Fills a column for rows that do not have it, as pd.DataFrame(list_of_dicts) does
+MISSING = float('nan')
+
+# Values stored once however many rows hold them
+SHARED_VALUES = {'N/A': 'N/A', '': ''}
+
+
+class _Column:
+    """One column of a ResultTable: a constant, codes into a list of strings, or a list of values."""
+
+    __slots__ = ('length', 'constant', 'values', 'codes', 'categories', 'index', 'categorical')
+
+    def __init__(self, length, categorical):
+        self.length = length
+        self.constant = MISSING
+        self.values = None
+        self.codes = None
+        self.categories = None
+        self.index = None
+        self.categorical = categorical
+
+    def _same(self, value):
+        return value is self.constant or (type(value) is type(self.constant) and value == self.constant)
+
+    def _code(self, value):
+        if value is MISSING:
+            return -1
+        code = self.index.get(value)
+        if code is None:
+            code = self.index[value] = len(self.categories)
+            self.categories.append(value)
+        return code
+
+    def _codable(self, value):
+        return value is MISSING or type(value) is str
+
+    def _materialize(self, value):
+        """Stops being a constant because a row holds something else."""
+        if self.categorical and self._codable(self.constant) and self._codable(value):
+            self.categories, self.index = [], {}
+            self.codes = array('i', [self._code(self.constant)]) * self.length
+        else:
+            self.values = [self.constant] * self.length
+
+    def _decode(self):
+        """Falls back from codes to a list, for a value that is not a string."""
+        self.values = [self.categories[code] if code >= 0 else MISSING for code in self.codes]
+        self.codes = self.categories = self.index = None
+
+    def append(self, value):
+        if self.values is None and self.codes is None:
+            if self.length == 0:
+                self.constant = value
+            if self.length == 0 or self._same(value):
+                self.length += 1
+                return
+            self._materialize(value)
+        if self.codes is not None:
+            if self._codable(value):
+                self.codes.append(self._code(value))
+                self.length += 1
+                return
+            self._decode()
+        if type(value) is str:
+            value = SHARED_VALUES.get(value, value)
+        self.values.append(value)
+        self.length += 1
+
+    def set(self, position, value):
+        if self.values is None and self.codes is None:
+            if self._same(value):
+                return
+            self._materialize(value)
+        if self.codes is not None:
+            if self._codable(value):
+                self.codes[position] = self._code(value)
+                return
+            self._decode()
+        self.values[position] = value
+
+    def to_series(self):
+        import pandas as pd
+
+        if self.codes is not None:
+            return pd.Series(pd.Categorical.from_codes(self.codes, self.categories))
+        # Object columns as they are: inferring a dtype costs more than building the column
+        if self.values is not None:
+            return pd.Series(self.values, dtype=object)
+        return pd.Series(self.constant, index=pd.RangeIndex(self.length), dtype=object)
+
+
+class ResultTable:
+    """
+    Result rows keyed by input row number. put() adds a row, or replaces the
+    row with that number; to_frame() returns them as a DataFrame in row
+    number order, with the columns in the order they were first seen.
+    """
+
+    def __init__(self, categorical=CATEGORICAL_COLUMNS):
+        self.categorical = set(categorical)
+        self._columns = {}
+        self._rows = array('q')
+        self._positions = {}
+
+    def __len__(self):
+        return len(self._rows)
+
+    @property
+    def columns(self):
+        return list(self._columns)
+
+    def put(self, row, result):
+        """Stores the result dict of an input row."""
+        position = self._positions.get(row)
+        if position is not None:
+            for name, column in self._columns.items():
+                column.set(position, result.get(name, MISSING))
+            for name in result:
+                if name not in self._columns:
+                    column = self._columns[name] = _Column(len(self._rows), name in self.categorical)
+                    column.set(position, result[name])
+            return
+
+        self._positions[row] = len(self._rows)
+        for name in result:
+            if name not in self._columns:
+                self._columns[name] = _Column(len(self._rows), name in self.categorical)
+        get = result.get
+        for name, column in self._columns.items():
+            column.append(get(name, MISSING))
+        self._rows.append(row)
+
+    def to_frame(self):
+        """Builds the DataFrame; constant columns are only expanded here."""
+        import pandas as pd
+
+        frame = pd.DataFrame({name: column.to_series() for name, column in self._columns.items()})
+        if any(a > b for a, b in zip(self._rows, self._rows[1:])):
+            order = sorted(range(len(self._rows)), key=self._rows.__getitem__)
+            frame = frame.take(order).reset_index(drop=True)
+        return frame
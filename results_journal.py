@@ -0,0 +1,88 @@
+import json
+import os
+import threading
+
+from result_store import ResultTable
+
+
+class ResultsJournal:
+    """
+    Append-only JSONL journal of finished companies.
+
+    Each line holds the input row number, the business name and the result
+    dict, and is flushed as soon as the company is done, so a crash loses at
+    most the rows that were still in flight. Later lines for the same row
+    replace earlier ones when the journal is read back.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = None
+
+    def _open(self):
+        if self._file is None:
+            # A crash can leave half a line at the end: start on a line of our own,
+            # or the first new entry would be lost with it
+            torn = False
+            if os.path.exists(self.path) and os.path.getsize(self.path) > 0:
+                with open(self.path, 'rb') as f:
+                    f.seek(-1, os.SEEK_END)
+                    torn = f.read(1) != b'\n'
+            self._file = open(self.path, 'a', encoding='utf-8')
+            if torn:
+                self._file.write('\n')
+        return self._file
+
+    def reset(self):
+        """
+        Starts an empty journal. A previous journal with results in it is
+        moved to path + '.bak' (replacing an older backup) rather than
+        discarded; returns that path, or None if there was nothing to keep.
+        """
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            backup = None
+            if os.path.exists(self.path) and os.path.getsize(self.path) > 0:
+                backup = self.path + '.bak'
+                os.replace(self.path, backup)
+            open(self.path, 'w', encoding='utf-8').close()
+            return backup
+
+    def append(self, row, business_name, result):
+        """Writes one finished company to the journal."""
+        line = json.dumps({'row': row, 'business_name': business_name, 'result': result}, ensure_ascii=False)
+        with self._lock:
+            f = self._open()
+            f.write(line + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+    def entries(self):
+        """Yields (row, business_name, result) for every readable line, in file order."""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # A half-written last line from a crash
+                    continue
+                yield entry['row'], entry['business_name'], entry['result']
+
+    def load_table(self):
+        """Returns the journalled results as a ResultTable keyed by input row, the last line for a row winning."""
+        table = ResultTable()
+        for row, _, result in self.entries():
+            table.put(row, result)
+        return table
+
+    def close(self):
+        """Closes the journal file."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
@@ -0,0 +1,119 @@
+"""
+BeautifulSoup-style wrapper around selectolax, for HTML_PARSER = 'selectolax'.
+
+selectolax builds the page tree with the lexbor C parser, many times
+faster than BeautifulSoup's tree builders, but has an API of its own.
+SelectolaxSoup implements the part of BeautifulSoup's API the page parsers
+in scraper.py use (find, find_all, get_text, get, [], find_parent and
+find_next_sibling) with the same results, so the parsers run unchanged on
+either backend.
+
+    pip install selectolax
+"""
+from selectolax.lexbor import LexborHTMLParser
+
+# Text inside these is not part of get_text(), as in BeautifulSoup
+HIDDEN_TEXT = frozenset(('script', 'style', 'template'))
+_HIDDEN_SELECTOR = ', '.join(sorted(HIDDEN_TEXT))
+
+# Stands for a filter that was not given (None is a filter: "no such attribute")
+_ANY = object()
+
+
+def _matches_class(value, class_):
+    """class_ as BeautifulSoup takes it: one class name, the whole class attribute, or None for no class."""
+    if class_ is None:
+        return not value
+    if not value:
+        return False
+    classes = value.split()
+    return class_ in classes or ' '.join(classes) == class_
+
+
+def _matches(node, class_, id):
+    attributes = node.attributes
+    if class_ is not _ANY and not _matches_class(attributes.get('class'), class_):
+        return False
+    if id is not _ANY:
+        value = attributes.get('id')
+        if callable(id):
+            return bool(id(value))
+        return value == id
+    return True
+
+
+class SelectolaxSoup:
+    """A parsed page, or one element of it."""
+
+    __slots__ = ('_node',)
+
+    def __init__(self, node):
+        self._node = node
+
+    @classmethod
+    def parse(cls, html):
+        return cls(LexborHTMLParser(html).root)
+
+    @property
+    def name(self):
+        return self._node.tag
+
+    @property
+    def attrs(self):
+        return self._node.attributes
+
+    def get(self, key, default=None):
+        attributes = self._node.attributes
+        if key not in attributes:
+            return default
+        # A valueless attribute (<input disabled>) reads as '', as in BeautifulSoup
+        return attributes[key] or ''
+
+    def __getitem__(self, key):
+        value = self.get(key, _ANY)
+        if value is _ANY:
+            raise KeyError(key)
+        return value
+
+    def find_all(self, name, class_=_ANY, id=_ANY, recursive=True):
+        """Descendant elements called name (children only if not recursive) matching class_ and id."""
+        if recursive:
+            # css() also matches the node itself, which BeautifulSoup leaves out
+            own_id = self._node.mem_id
+            nodes = (node for node in self._node.css(name) if node.mem_id != own_id)
+        else:
+            nodes = (node for node in self._node.iter() if node.tag == name)
+        return [SelectolaxSoup(node) for node in nodes if _matches(node, class_, id)]
+
+    def find(self, name, class_=_ANY, id=_ANY, recursive=True):
+        found = self.find_all(name, class_, id, recursive)
+        return found[0] if found else None
+
+    def find_parent(self, name):
+        node = self._node.parent
+        while node is not None and node.tag != name:
+            node = node.parent
+        return SelectolaxSoup(node) if node is not None else None
+
+    def find_next_sibling(self, name):
+        node = self._node.next
+        while node is not None and node.tag != name:
+            node = node.next
+        return SelectolaxSoup(node) if node is not None else None
+
+    def get_text(self, separator='', strip=False):
+        """The element's text, without comments or script/style contents; strip works per text node."""
+        node = self._node
+        if node.css_first(_HIDDEN_SELECTOR) is None:
+            return node.text(deep=True, separator=separator, strip=strip)
+        parts = []
+        for child in node.traverse(include_text=True):
+            if child.tag != '-text' or child.parent.tag in HIDDEN_TEXT:
+                continue
+            text = child.text_content or ''
+            if strip:
+                text = text.strip()
+                if not text:
+                    continue
+            parts.append(text)
+        return separator.join(parts)
@@ -0,0 +1,40 @@
+import os
+import sys
+
+import pytest
+
+# The fake GOV.UK, Endole and Companies House API live with the benchmarks
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'benchmarks'))
+
+from fake_sites import FakeSite, point_scraper_at  # noqa: E402
+
+
+@pytest.fixture
+def api_site():
+    site = FakeSite('api', api_keys=['key-a', 'key-b'], seed=1).start()
+    yield site
+    site.stop()
+
+
+@pytest.fixture
+def sites(monkeypatch, tmp_path):
+    """A fake GOV.UK and Endole the scraper is pointed at, with no delays, cache or URL map."""
+    import scraper
+
+    gov = FakeSite('gov', seed=1).start()
+    endole = FakeSite('endole', seed=1).start()
+    for name in ('SEARCH_URL_GOV', 'GOV_BASE_URL', 'SEARCH_URL_ENDOLE', 'ENDOLE_DETAIL_BASE_URL'):
+        monkeypatch.setattr(scraper, name, getattr(scraper, name))
+    point_scraper_at(scraper, gov, endole)
+    monkeypatch.setattr(scraper, 'CACHE_ENABLED', False)
+    monkeypatch.setattr(scraper, 'URL_MAP_FILE', None)
+    monkeypatch.setattr(scraper, 'RATE_LIMITERS', {source: scraper.AdaptiveRateLimiter(1000.0, 1000.0)
+                                                   for source in scraper.RATE_LIMITERS})
+    monkeypatch.setattr(scraper, 'CIRCUIT_BREAKERS', {source: scraper.CircuitBreaker(source) for source in scraper.RATE_LIMITERS})
+    for name in ('URL_FETCHES', 'COMPANY_LOOKUPS', 'ENDOLE_DETAILS'):
+        monkeypatch.setattr(scraper, name, scraper.SingleFlight(getattr(scraper, name).max_entries))
+    monkeypatch.chdir(tmp_path)
+    yield gov, endole
+    scraper.SESSIONS.close()
+    gov.stop()
+    endole.stop()
@@ -0,0 +1,108 @@
+import time
+
+import pytest
+
+import ch_api
+import scraper
+from ch_api import CompaniesHouseAPI, CompaniesHouseAPIError, KeyScheduler
+from fake_sites import FakeSite, crn_for
+from response_cache import ResponseCache
+
+
+def test_search_and_profile(api_site):
+    client = CompaniesHouseAPI(['key-a'], base_url=api_site.base_url)
+    items = client.search('Acme Builders Limited')
+    assert items[0]['title'] == 'ACME BUILDERS LIMITED'
+    data = CompaniesHouseAPI.to_gov_data(client.profile(items[0]['company_number']))
+    assert data == {
+        'full_address': '12 High Street, Manchester, England, M1 2AB',
+        'crn': crn_for('ACME BUILDERS LIMITED'),
+        'name': 'ACME BUILDERS LIMITED',
+        'incorporation_date': '15 March 2012',
+        'status': 'Active',
+        'company_type': 'Private limited company',
+        'sic': '41201 - Construction of commercial buildings',
+    }
+
+
+def test_unknown_company_profile_is_none(api_site):
+    client = CompaniesHouseAPI(['key-a'], base_url=api_site.base_url)
+    assert client.profile('99999999') is None
+
+
+def test_rejected_key_raises(api_site):
+    client = CompaniesHouseAPI(['not-a-key'], base_url=api_site.base_url)
+    with pytest.raises(CompaniesHouseAPIError):
+        client.search('Acme Builders Limited')
+
+
+def test_requests_rotate_over_keys(api_site):
+    client = CompaniesHouseAPI(['key-a', 'key-b'], base_url=api_site.base_url, limit=2)
+    for _ in range(4):
+        client.search('Acme Builders Limited')
+    assert sorted(len(sent) for sent in api_site._api_requests.values()) == [2, 2]
+
+
+def test_scheduler_waits_for_the_window():
+    scheduler = KeyScheduler(['a', 'b'], limit=1, window=60)
+    first, second = scheduler.reserve(), scheduler.reserve()
+    assert {first[0], second[0]} == {'a', 'b'} and first[1] == second[1] == 0
+    _, wait = scheduler.reserve()
+    assert 59 < wait <= 60
+
+
+@pytest.mark.parametrize('shared_key', [False, True])
+def test_exhausted_key_is_parked_until_reset(shared_key):
+    site = FakeSite('api', api_keys=['key-a'], api_limit=1, api_window=1).start()
+    try:
+        client = CompaniesHouseAPI(['key-a'], base_url=site.base_url)
+        # Another process using the same key only finds out from a 429
+        other = CompaniesHouseAPI(['key-a'], base_url=site.base_url) if shared_key else client
+        client.search('Acme Builders Limited')
+        started = time.monotonic()
+        assert other.search('Old Mill Bakery Limited')[0]['title'] == 'OLD MILL BAKERY LIMITED'
+        assert time.monotonic() - started >= 0.5
+        assert other.requests == 2
+        assert site.counts.get(429, 0) == (1 if shared_key else 0)
+    finally:
+        site.stop()
+
+
+def test_cache_and_revalidate(api_site, tmp_path):
+    cache = ResponseCache(str(tmp_path / 'cache'))
+    client = CompaniesHouseAPI(['key-a'], base_url=api_site.base_url, cache=cache)
+    client.search('Acme Builders Limited')
+    client.search('Acme Builders Limited')
+    assert client.requests == 1
+    offline = CompaniesHouseAPI(['key-a'], base_url=api_site.base_url, cache=cache, offline=True)
+    assert offline.search('Acme Builders Limited') and offline.search('Someone Else') == []
+    assert offline.requests == 0
+    revalidating = CompaniesHouseAPI(['key-a'], base_url=api_site.base_url, cache=cache, revalidate=True)
+    revalidating.search('Acme Builders Limited')
+    assert revalidating.requests == 1
+    cache.close()
+
+
+def test_main_reports_missing_profile(api_site, monkeypatch, capsys):
+    monkeypatch.setattr(CompaniesHouseAPI, 'profile', lambda self, crn: None)
+    ch_api.main(['key-a', 'Acme Builders Limited', '--base-url', api_site.base_url])
+    assert 'No company profile for' in capsys.readouterr().out
+
+
+def test_api_registry_backend(api_site, monkeypatch):
+    monkeypatch.setattr(scraper, 'CH_BULK_DB', None)
+    backend = scraper.ApiRegistryBackend(CompaniesHouseAPI(['key-b'], base_url=api_site.base_url))
+    data = backend.lookup('Acme Builders Ltd')
+    crn = crn_for('ACME BUILDERS LTD')
+    assert data['crn'] == crn and data['postcode'] == 'M1 2AB' and data['city'] == 'Manchester'
+    assert backend.lookup_crn(crn) == data
+    assert backend.lookup_crn('99999999') == {}
+
+
+def test_registry_backend_is_abstract():
+    class NameOnly(scraper.RegistryBackend):
+        def lookup(self, company_name):
+            return {}
+
+    with pytest.raises(TypeError):
+        NameOnly()
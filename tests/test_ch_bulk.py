@@ -0,0 +1,59 @@
+import os
+
+import pytest
+
+import ch_bulk
+import scraper
+from ch_bulk import CompaniesHouseStore
+
+SAMPLE_CSV = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'fixtures', 'BasicCompanyData-sample.csv')
+
+QUERIES = [
+    'ACME BUILDERS LIMITED', 'Acme Builders Ltd', 'Acme Builders', 'Acme Builders (South) Ltd',
+    'Smith and Jones Solicitors', 'Smith & Jones Solicitors LLP', 'Old Mill Bakery Co',
+    'The Green Cafe', 'Nothing Here Ltd', '&',
+]
+
+
+@pytest.fixture(scope='module')
+def store(tmp_path_factory):
+    db_path = str(tmp_path_factory.mktemp('ch') / 'companies.sqlite')
+    ch_bulk.ingest(SAMPLE_CSV, db_path)
+    return CompaniesHouseStore(db_path)
+
+
+def test_find_and_get(store):
+    row = store.find('acme builders limited')
+    assert row['name'] == 'ACME BUILDERS LIMITED'
+    assert store.get(row['crn'].lower())['name'] == row['name']
+    assert store.find('Nothing Here Ltd') is None
+
+
+def test_batch_lookups_match_single_lookups(store):
+    assert store.exact_batch(QUERIES) == [store.exact(name) for name in QUERIES]
+    batch = store.candidates_batch(QUERIES, limit=2)
+    single = [store.candidates(name, limit=2) for name in QUERIES]
+    assert [[row['crn'] for row in rows] for rows in batch] == [[row['crn'] for row in rows] for rows in single]
+
+
+def test_match_in_snapshot_batch_matches_single(store, monkeypatch):
+    monkeypatch.setattr(scraper, 'MATCH_BATCH_SIZE', 3)
+    matches = scraper.match_in_snapshot_batch(QUERIES, store)
+    for name in QUERIES:
+        single = scraper.match_in_snapshot(name, store)
+        assert (matches[name] and matches[name]['crn']) == (single and single['crn']), name
+    assert matches['Smith and Jones Solicitors']['name'] == 'SMITH & JONES SOLICITORS LLP'
+    assert matches['Nothing Here Ltd'] is None
+
+
+def test_match_in_snapshot_batch_reads_each_chunk_with_two_queries(store, monkeypatch):
+    monkeypatch.setattr(scraper, 'MATCH_BATCH_SIZE', 4)
+    statements = []
+    store._db().set_trace_callback(statements.append)
+    try:
+        scraper.match_in_snapshot_batch(QUERIES, store)
+    finally:
+        store._db().set_trace_callback(None)
+    chunks = -(-len(QUERIES) // 4)
+    assert sum(1 for sql in statements if sql.startswith('BEGIN')) == chunks
+    assert sum(1 for sql in statements if 'FROM companies' in sql) <= 2 * chunks
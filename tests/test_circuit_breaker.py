@@ -0,0 +1,70 @@
+import pytest
+
+import scraper
+from scraper import CircuitBreaker
+
+
+def opened(breaker):
+    for _ in range(breaker.min_requests):
+        assert breaker.allow()
+        breaker.record(False)
+    assert breaker.state == 'open'
+    return breaker
+
+
+def test_opens_after_failures_and_closes_after_a_good_probe():
+    breaker = opened(CircuitBreaker('gov', min_requests=4, open_seconds=0))
+    assert breaker.allow()
+    assert breaker.state == 'half_open'
+    # One probe at a time
+    assert not breaker.allow()
+    breaker.record(True)
+    assert breaker.state == 'closed'
+
+
+def test_failed_probe_doubles_the_pause():
+    breaker = opened(CircuitBreaker('gov', min_requests=4, open_seconds=0.001, max_open_seconds=1))
+    breaker._opened_at -= 1
+    assert breaker.allow()
+    breaker.record(False)
+    assert breaker.state == 'open' and breaker._open_for == 0.002
+
+
+def test_late_outcomes_do_not_count_as_the_probe():
+    breaker = opened(CircuitBreaker('gov', min_requests=4, open_seconds=60))
+    breaker.record(False)
+    breaker.record(True)
+    assert breaker.state == 'open' and breaker._open_for == 60
+
+
+@pytest.fixture
+def half_open(sites, monkeypatch):
+    breaker = opened(CircuitBreaker('gov', min_requests=4, open_seconds=0))
+    monkeypatch.setitem(scraper.CIRCUIT_BREAKERS, 'gov', breaker)
+    return breaker
+
+
+def test_session_setup_failure_frees_the_probe(sites, half_open, monkeypatch):
+    gov, _ = sites
+
+    def broken(source):
+        raise RuntimeError('no session')
+
+    get_session = scraper.SESSIONS.get
+    monkeypatch.setattr(scraper.SESSIONS, 'get', broken)
+    assert scraper._fetch_url_with_retry(gov.base_url + '/company/01234567') is None
+    assert not half_open._probing and half_open.state == 'open'
+
+    # The next probe goes through and closes the circuit
+    monkeypatch.setattr(scraper.SESSIONS, 'get', get_session)
+    assert scraper._fetch_url_with_retry(gov.base_url + '/company/01234567')
+    assert half_open.state == 'closed'
+
+
+def test_abandoned_fetch_frees_the_probe(sites, half_open):
+    gov, _ = sites
+    steps = scraper._fetch_attempts(gov.base_url + '/company/01234567', 'gov')
+    assert next(steps)[0] == 'get'
+    assert half_open._probing
+    steps.close()
+    assert not half_open._probing
@@ -0,0 +1,135 @@
+import threading
+import time
+
+import pytest
+
+import scraper
+from coalesce import SingleFlight
+
+
+def run_concurrently(sf, key, count, fn, remember=lambda value: True):
+    """Starts count threads calling sf.do(key, ...) while the first call is still running; returns their results."""
+    release = threading.Event()
+    calls = []
+    calls_lock = threading.Lock()
+
+    def blocking_fn(i):
+        with calls_lock:
+            calls.append(i)
+            first = len(calls) == 1
+        if first:
+            release.wait(5)
+        return fn(i)
+
+    results = [None] * count
+    threads = [threading.Thread(target=lambda i=i: results.__setitem__(i, sf.do(key, lambda: blocking_fn(i), remember)))
+               for i in range(count)]
+    for thread in threads:
+        thread.start()
+    # Wait until every other thread has joined the first one's call
+    deadline = time.monotonic() + 5
+    while sf.shared < count - 1 and time.monotonic() < deadline:
+        time.sleep(0.001)
+    assert sf.shared == count - 1
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    return results, calls
+
+
+def test_concurrent_calls_share_one_result():
+    sf = SingleFlight()
+    results, calls = run_concurrently(sf, 'acme', 3, lambda i: {'value': 'ok'})
+    assert len(calls) == 1
+    assert results == [{'value': 'ok'}] * 3
+    assert sf.shared == 2
+
+
+def test_rejected_result_is_not_shared_with_waiters():
+    sf = SingleFlight()
+    results, calls = run_concurrently(sf, 'acme', 3, lambda i: {'caller': i, 'Backfill': 'Endole'},
+                                      remember=lambda value: not value['Backfill'])
+    assert sorted(calls) == [0, 1, 2]
+    assert sorted(result['caller'] for result in results) == [0, 1, 2]
+    assert sf.shared == 0
+    # Nor remembered for later calls
+    assert sf.do('acme', lambda: {'caller': 3, 'Backfill': ''})['caller'] == 3
+
+
+def test_remembered_result_is_reused():
+    sf = SingleFlight()
+    assert sf.do('acme', lambda: 1) == 1
+    assert sf.do('acme', lambda: 2) == 1
+    assert sf.hits == 1
+
+
+def test_max_entries_drops_least_recently_used():
+    sf = SingleFlight(max_entries=2)
+    for key in 'abc':
+        sf.do(key, lambda key=key: key)
+    assert sf.do('a', lambda: 'again') == 'again'
+    assert sf.do('c', lambda: 'again') == 'c'
+
+
+def test_error_is_raised_in_waiters_and_not_remembered():
+    sf = SingleFlight()
+    release = threading.Event()
+    errors = []
+
+    def fail():
+        release.wait(5)
+        raise ValueError('down')
+
+    def call():
+        try:
+            sf.do('acme', fail)
+        except ValueError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=call) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    deadline = time.monotonic() + 5
+    while sf.shared < 1 and time.monotonic() < deadline:
+        time.sleep(0.001)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    assert len(errors) == 2
+    assert sf.do('acme', lambda: 'ok') == 'ok'
+
+
+@pytest.mark.parametrize('unusable', [{'Backfill': 'Endole', 'Notes': ''}, {'Backfill': '', 'Notes': 'Error: timeout'}])
+def test_process_company_duplicates_in_flight_look_up_again(monkeypatch, unusable):
+    monkeypatch.setattr(scraper, 'COMPANY_LOOKUPS', SingleFlight())
+    monkeypatch.setattr(scraper, 'DEDUPE_LOOKUPS', True)
+    release = threading.Event()
+    looked_up = []
+    lock = threading.Lock()
+
+    def lookup_company(company_name):
+        with lock:
+            looked_up.append(company_name)
+            first = len(looked_up) == 1
+        if first:
+            release.wait(5)
+            return {'Business Name': company_name, **unusable}
+        return {'Business Name': company_name, 'Backfill': '', 'Notes': ''}
+
+    monkeypatch.setattr(scraper, 'lookup_company', lookup_company)
+    names = ['Acme Ltd', 'ACME LIMITED', 'acme ltd']
+    results = {}
+    threads = [threading.Thread(target=lambda name=name: results.__setitem__(name, scraper.process_company(name)))
+               for name in names]
+    for thread in threads:
+        thread.start()
+    deadline = time.monotonic() + 5
+    while scraper.COMPANY_LOOKUPS.shared < 2 and time.monotonic() < deadline:
+        time.sleep(0.001)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert sorted(looked_up) == sorted(names)
+    assert sum(1 for result in results.values() if result == {**result, **unusable}) == 1
+    assert all(result['Business Name'] == name for name, result in results.items())
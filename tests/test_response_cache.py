@@ -0,0 +1,84 @@
+import os
+
+import pytest
+
+from response_cache import ResponseCache, normalize_url
+
+URL = 'https://Find-And-Update.Company-Information.Service.gov.uk/search?q=acme+builders&page=1'
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ResponseCache(str(tmp_path / 'cache'), ttls={'gov': 60})
+    yield cache
+    cache.close()
+
+
+def age(cache, url, seconds):
+    cache._db.execute("UPDATE entries SET fetched_at = fetched_at - ? WHERE key = ?", (seconds, normalize_url(url)))
+
+
+def test_normalize_url():
+    assert normalize_url(URL + '#top') == normalize_url('https://find-and-update.company-information.service.gov.uk/search?page=1&q=acme%20builders')
+
+
+def test_put_and_get(cache):
+    assert cache.get(URL, 'gov') is None
+    cache.put(URL, 'gov', '<html>Acme</html>')
+    assert cache.get(URL.replace('+', '%20'), 'gov') == '<html>Acme</html>'
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_entries_expire_per_source(cache):
+    cache.put(URL, 'gov', 'gov page')
+    cache.put(URL + '&x=1', 'endole', 'endole page')
+    age(cache, URL, 61)
+    age(cache, URL + '&x=1', 61)
+    assert cache.get(URL, 'gov') is None
+    assert cache.get(URL, 'gov', ignore_ttl=True) == 'gov page'
+    assert cache.get(URL + '&x=1', 'endole') == 'endole page'
+
+
+def test_expired_entry_is_revalidated(cache):
+    cache.put(URL, 'gov', 'page', etag='"v1"')
+    cache.put(URL + '&x=1', 'gov', 'other page')
+    age(cache, URL, 61)
+    assert cache.validators(URL) == {'etag': '"v1"', 'last_modified': None}
+    assert cache.validators(URL + '&x=1') is None
+    assert cache.revalidate(URL) == 'page'
+    assert cache.get(URL, 'gov') == 'page'
+    assert cache.revalidate(URL + '&y=1') is None
+
+
+def test_identical_bodies_share_one_blob(cache):
+    cache.put(URL, 'gov', 'same page')
+    cache.put(URL + '&x=1', 'gov', 'same page')
+    assert cache._db.execute("SELECT COUNT(*) FROM blobs").fetchone()[0] == 1
+
+
+def test_missing_blob_drops_every_entry_sharing_it(cache):
+    cache.put(URL, 'gov', 'same page')
+    cache.put(URL + '&x=1', 'gov', 'same page')
+    body_hash = cache._db.execute("SELECT hash FROM blobs").fetchone()[0]
+    os.remove(cache._blob_path(body_hash))
+    assert cache.get(URL, 'gov') is None
+    assert cache._db.execute("SELECT COUNT(*) FROM entries").fetchone()[0] == 0
+    # The next put writes the body again
+    cache.put(URL + '&x=1', 'gov', 'same page')
+    assert cache.get(URL + '&x=1', 'gov') == 'same page'
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    pages = [os.urandom(2000).hex() for _ in range(3)]
+    cache = ResponseCache(str(tmp_path / 'cache'), max_bytes=6000)
+    try:
+        cache.put(URL + '&n=0', 'gov', pages[0])
+        cache.put(URL + '&n=1', 'gov', pages[1])
+        cache._db.execute("UPDATE entries SET last_access = last_access - 10 WHERE key = ?", (normalize_url(URL + '&n=1'),))
+        cache.put(URL + '&n=2', 'gov', pages[2])
+        assert cache.get(URL + '&n=1', 'gov') is None
+        assert cache.get(URL + '&n=0', 'gov') == pages[0] and cache.get(URL + '&n=2', 'gov') == pages[2]
+        assert sum(len(files) for _, _, files in os.walk(os.path.join(cache.directory, 'objects'))) == 2
+        assert cache._db.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0] <= 6000
+    finally:
+        cache.close()
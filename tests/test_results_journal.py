@@ -0,0 +1,84 @@
+import json
+
+import pandas as pd
+
+import scraper
+from results_journal import ResultsJournal
+
+NAMES = ['ACME BUILDERS LIMITED', 'OLD MILL BAKERY LIMITED', 'THE GREEN CAFE LTD']
+
+
+def test_entries_skip_a_half_written_line(tmp_path):
+    journal = ResultsJournal(str(tmp_path / 'journal.jsonl'))
+    journal.append(0, 'Acme', {'CRN': '1'})
+    journal.append(1, 'Bakery', {'CRN': '2'})
+    journal.close()
+    with open(journal.path, 'a', encoding='utf-8') as f:
+        f.write('{"row": 2, "business_na')
+    assert list(journal.entries()) == [(0, 'Acme', {'CRN': '1'}), (1, 'Bakery', {'CRN': '2'})]
+    # Resuming appends after the torn line, not onto it
+    resumed = ResultsJournal(journal.path)
+    resumed.append(2, 'Cafe', {'CRN': '3'})
+    resumed.close()
+    assert [row for row, _, _ in resumed.entries()] == [0, 1, 2]
+
+
+def test_load_table_keeps_the_last_line_per_row(tmp_path):
+    journal = ResultsJournal(str(tmp_path / 'journal.jsonl'))
+    journal.append(1, 'Bakery', {'CRN': 'N/A', 'Notes': 'Error: timeout'})
+    journal.append(0, 'Acme', {'CRN': '1', 'Notes': ''})
+    journal.append(1, 'Bakery', {'CRN': '2', 'Notes': ''})
+    journal.close()
+    frame = journal.load_table().to_frame()
+    assert list(frame['CRN']) == ['1', '2']
+
+
+def test_reset_keeps_the_previous_journal(tmp_path):
+    path = str(tmp_path / 'journal.jsonl')
+    journal = ResultsJournal(path)
+    assert journal.reset() is None
+    journal.append(0, 'Acme', {'CRN': '1'})
+    assert journal.reset() == path + '.bak'
+    assert list(journal.entries()) == []
+    assert list(ResultsJournal(path + '.bak').entries()) == [(0, 'Acme', {'CRN': '1'})]
+    # An empty journal is not worth a backup, and does not replace the one there is
+    assert journal.reset() is None
+    assert list(ResultsJournal(path + '.bak').entries()) == [(0, 'Acme', {'CRN': '1'})]
+
+
+def run(*argv):
+    scraper.main(['run', '--input', 'input.csv', '--output', 'output.xlsx', '--workers', '2', *argv])
+
+
+def test_rerun_without_resume_moves_the_journal_aside(sites):
+    pd.DataFrame({'Business Name': NAMES}).to_csv('input.csv', index=False)
+    run()
+    with open(scraper.JOURNAL_FILENAME, encoding='utf-8') as f:
+        first_run = f.read()
+    run()
+    with open(scraper.JOURNAL_FILENAME + '.bak', encoding='utf-8') as f:
+        assert f.read() == first_run
+    assert len(list(ResultsJournal(scraper.JOURNAL_FILENAME).entries())) == len(NAMES)
+
+
+def test_resume_only_looks_up_unfinished_rows(sites):
+    gov, _ = sites
+    pd.DataFrame({'Business Name': NAMES}).to_csv('input.csv', index=False)
+    run()
+    full = pd.read_excel('output.xlsx', dtype=str)
+
+    # As if the run had crashed after the first two rows, mid-way through writing the third
+    with open(scraper.JOURNAL_FILENAME, encoding='utf-8') as f:
+        lines = sorted(f, key=lambda line: json.loads(line)['row'])
+    with open(scraper.JOURNAL_FILENAME, 'w', encoding='utf-8') as f:
+        f.writelines(lines[:2])
+        f.write(lines[2][:20])
+    gov.counts.clear()
+    for name in ('COMPANY_LOOKUPS', 'ENDOLE_DETAILS'):
+        setattr(scraper, name, scraper.SingleFlight())
+    run('--resume')
+
+    assert gov.counts == {200: 2}
+    resumed = pd.read_excel('output.xlsx', dtype=str)
+    assert list(resumed['Business Name']) == NAMES
+    assert list(resumed['CRN']) == list(full['CRN'])
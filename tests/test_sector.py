@@ -0,0 +1,112 @@
+import os
+
+import pandas as pd
+import pytest
+
+import scraper
+from scraper import SECTOR_KEYWORDS_MAP_LOWER, SectorClassifier
+from sic_codes import SIC_DESCRIPTIONS
+
+SIC_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'fixtures', 'sic_descriptions.txt')
+
+
+def legacy_map_sic_to_sector(sic_description):
+    """The original keyword loop, the reference for substrings=True."""
+    if not sic_description or sic_description.lower() == 'n/a':
+        return 'N/A'
+
+    desc_lower = sic_description.lower()
+    best_match = 'Multi sector company'
+    max_keyword_length = 0
+
+    if 'dormant company' in desc_lower:
+        return 'Dormant company'
+
+    for sector, keywords in SECTOR_KEYWORDS_MAP_LOWER.items():
+        if sector == 'Dormant company': continue
+
+        for keyword in keywords:
+            if keyword in desc_lower:
+                if len(keyword) > max_keyword_length:
+                    best_match = sector
+                    max_keyword_length = len(keyword)
+
+    return best_match if max_keyword_length > 0 else 'Sector Unknown'
+
+
+def sic_corpus():
+    """Every SIC 2007 description as the registry and the fixtures spell it, plus edge cases."""
+    with open(SIC_FILE, encoding='utf-8') as f:
+        fixture = [line.strip() for line in f if line.strip()]
+    corpus = list(SIC_DESCRIPTIONS.values())
+    corpus += [f"{code} - {desc}" for code, desc in SIC_DESCRIPTIONS.items()]
+    corpus += [desc.upper() for desc in SIC_DESCRIPTIONS.values()]
+    corpus += fixture + [line.split(' - ', 1)[-1] for line in fixture]
+    corpus += ['', 'N/A', 'n/a', 'Dormant Company', 'DORMANT COMPANY - no trading', 'Physiotherapy activities',
+               'Shipbuilding', 'Repair of machinery', 'Public houses and bars', 'Taxi operation', 'bar', 'ai']
+    return corpus
+
+
+@pytest.fixture(scope='module')
+def substring_classifier():
+    return SectorClassifier(SECTOR_KEYWORDS_MAP_LOWER, substrings=True)
+
+
+def test_substring_mode_matches_original(substring_classifier):
+    corpus = sic_corpus()
+    differences = [(desc, legacy_map_sic_to_sector(desc), substring_classifier.classify(desc)) for desc in corpus
+                   if substring_classifier.classify(desc) != legacy_map_sic_to_sector(desc)]
+    assert not differences
+
+
+def test_substring_mode_batch_matches_original(substring_classifier):
+    corpus = sic_corpus()
+    batch = substring_classifier.classify_series(pd.Series(corpus))
+    assert list(batch) == [legacy_map_sic_to_sector(desc) for desc in corpus]
+
+
+def test_batch_matches_single():
+    corpus = sic_corpus() + [None]
+    batch = scraper.map_sic_to_sector_batch(pd.Series(corpus))
+    assert list(batch) == [scraper.map_sic_to_sector(desc) for desc in corpus]
+
+
+@pytest.mark.parametrize('description, sector', [
+    ('Repair of computers and peripheral equipment', 'Maintenance and repair of motor vehicles'),
+    ('Barber shops', 'Beauty'),
+    ('Public houses and bars', 'Restaurants'),
+    ('Licensed restaurants', 'Restaurants'),
+    ('Taxi operation', 'Transport'),
+    ('Activities of business and employers membership organizations', 'Sector Unknown'),
+    ('Raising of dairy cattle', 'Sector Unknown'),
+    ('Space hire', 'Sector Unknown'),
+    ('Warehousing and storage', 'Freight and logistics'),
+    ('Passenger rail transport, interurban', 'Transport'),
+    ('Railway construction', 'Builders and construction'),
+    ('Dormant Company', 'Dormant company'),
+    ('N/A', 'N/A'),
+    ('', 'N/A'),
+    (None, 'N/A'),
+])
+def test_word_matching(description, sector):
+    assert scraper.map_sic_to_sector(description) == sector
+
+
+@pytest.mark.parametrize('description', ['Repair of machinery', 'Hairdressing', 'Retail trade of motor vehicle parts'])
+def test_short_keywords_do_not_match_inside_words(description):
+    classifier = SectorClassifier({'IT': ['ai'], 'Restaurants': ['bar'], 'Other': ['zzzz']})
+    assert classifier.classify(description) == 'Sector Unknown'
+    assert SectorClassifier({'IT': ['ai']}, substrings=True).classify(description) == 'IT'
+
+
+def test_longest_keyword_wins_and_ties_go_to_first_sector():
+    classifier = SectorClassifier({'A': ['alpha'], 'B': ['alpha beta'], 'C': ['gamma'], 'D': ['delta']})
+    assert classifier.classify('alpha beta gamma') == 'B'
+    assert classifier.classify('delta gamma') == 'C'
+
+
+def test_memo_is_bounded():
+    classifier = SectorClassifier(SECTOR_KEYWORDS_MAP_LOWER, memo_size=3)
+    for desc in list(SIC_DESCRIPTIONS.values())[:10]:
+        classifier.classify(desc)
+    assert len(classifier._memo) <= 3
@@ -0,0 +1,83 @@
+import pandas as pd
+import pytest
+
+import scraper
+from work_queue import WorkQueue
+
+
+@pytest.fixture
+def queue(tmp_path):
+    queue = WorkQueue(str(tmp_path / 'queue.sqlite'), lease_seconds=60, max_attempts=2)
+    queue.enqueue([(0, 'Acme'), (1, 'Bakery'), (2, 'Cafe')], columns=['Business Name', 'Town'])
+    return queue
+
+
+def expire_leases(queue):
+    with queue._connect() as db:
+        db.execute("UPDATE jobs SET lease_expires = lease_expires - 3600 WHERE state = 'leased'")
+
+
+def test_enqueue_is_idempotent(queue):
+    assert queue.enqueue([(2, 'Cafe'), (3, 'Deli')]) == 1
+    assert queue.stats()['pending'] == 4
+    assert queue.columns() == ['Business Name', 'Town']
+
+
+def test_leased_jobs_are_not_handed_out_twice(queue):
+    assert queue.lease('a', count=2) == [(0, 'Acme'), (1, 'Bakery')]
+    assert queue.lease('b', count=2) == [(2, 'Cafe')]
+    assert queue.lease('b') == []
+    assert not queue.is_drained()
+
+
+def test_expired_lease_goes_back_to_the_queue(queue):
+    queue.lease('a', count=3)
+    expire_leases(queue)
+    assert queue.stats()['expired'] == 3
+    assert queue.lease('b') == [(0, 'Acme')]
+    # The first worker finishing late is harmless: the row is written once
+    assert queue.complete(0, 'a', {'CRN': '1'})
+    assert not queue.complete(0, 'b', {'CRN': 'other'})
+    assert list(queue.results()) == [(0, 'Acme', {'CRN': '1'})]
+
+
+def test_extend_keeps_a_lease_alive(queue):
+    queue.lease('a', count=3)
+    expire_leases(queue)
+    queue.extend('a', [0])
+    assert queue.lease('b', count=3) == [(1, 'Bakery'), (2, 'Cafe')]
+
+
+def test_failed_jobs_are_retried_until_max_attempts(queue):
+    queue.lease('a', count=3)
+    queue.fail(0, 'a', 'timeout')
+    queue.fail(1, 'a', 'timeout', result={'CRN': 'N/A', 'Notes': 'Error: timeout'})
+    queue.complete(2, 'a', {'CRN': '3'})
+    assert queue.lease('b', count=3) == [(0, 'Acme'), (1, 'Bakery')]
+    queue.fail(0, 'b', 'timeout')
+    queue.fail(1, 'b', 'timeout', result={'CRN': 'N/A', 'Notes': 'Error: timeout'})
+    assert queue.is_drained()
+    assert queue.stats() == {'pending': 0, 'leased': 0, 'expired': 0, 'done': 2, 'failed': 1}
+    assert list(queue.unfinished()) == [(0, 'Acme', 'failed', 'timeout')]
+    assert queue.retry_failed() == 1
+    assert queue.lease('c') == [(0, 'Acme')]
+
+
+def test_out_of_attempts_lease_does_not_come_back(queue):
+    for worker in ('a', 'b'):
+        queue.lease(worker, count=3)
+        expire_leases(queue)
+    assert queue.lease('c') == []
+    assert queue.is_drained()
+    assert queue.retry_failed() == 3
+
+
+def test_enqueue_worker_and_merge(sites, monkeypatch):
+    monkeypatch.setattr(scraper, 'QUEUE_POLL_SECONDS', 0.05)
+    names = ['ACME BUILDERS LIMITED', 'OLD MILL BAKERY LIMITED', 'THE GREEN CAFE LTD']
+    pd.DataFrame({'Business Name': names}).to_csv('input.csv', index=False)
+    for option in ('--enqueue', '--worker', '--worker', '--merge'):
+        scraper.main(['run', '--input', 'input.csv', '--output', 'output.xlsx', '--workers', '2', option, 'queue.sqlite'])
+    merged = pd.read_excel('output.xlsx', dtype=str)
+    assert list(merged['Business Name']) == names
+    assert merged['CRN'].ne('N/A').all()
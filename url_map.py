@@ -0,0 +1,76 @@
+"""
+Persistent map of canonical page URLs, so a page whose address we had to
+guess or that redirected is fetched at its real address next time.
+
+Two kinds of entries are kept in one SQLite table: 'endole', a company
+number's canonical Endole detail page (taken from the link in the search
+results, or from where a guessed URL redirected to), and 'redirect', the
+final URL a redirecting URL led to. Keys are written by every thread and
+any number of processes sharing the file; the last write wins.
+
+    python url_map.py url_map.sqlite
+"""
+import argparse
+import sqlite3
+import threading
+import time
+
+
+class UrlMap:
+    """(kind, key) -> URL map in SQLite. One connection, shared by the threads of a process."""
+
+    def __init__(self, path, timeout=30):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=timeout, check_same_thread=False)
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS urls (
+                kind TEXT NOT NULL,
+                key TEXT NOT NULL,
+                url TEXT NOT NULL,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (kind, key)
+            );
+        """)
+        self._db.commit()
+
+    def get(self, kind, key):
+        """The URL recorded for a key, or None."""
+        with self._lock:
+            row = self._db.execute("SELECT url FROM urls WHERE kind = ? AND key = ?", (kind, key)).fetchone()
+        return row[0] if row else None
+
+    def put(self, kind, key, url):
+        """Records a URL for a key. Returns True if it is new or changed."""
+        with self._lock:
+            row = self._db.execute("SELECT url FROM urls WHERE kind = ? AND key = ?", (kind, key)).fetchone()
+            if row and row[0] == url:
+                return False
+            self._db.execute(
+                "INSERT OR REPLACE INTO urls (kind, key, url, updated_at) VALUES (?, ?, ?, ?)",
+                (kind, key, url, time.time())
+            )
+            self._db.commit()
+        return True
+
+    def counts(self):
+        """Returns {kind: number of entries}."""
+        with self._lock:
+            return dict(self._db.execute("SELECT kind, COUNT(*) FROM urls GROUP BY kind").fetchall())
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Show what a canonical URL map holds.")
+    parser.add_argument('path')
+    args = parser.parse_args(argv)
+
+    for kind, count in sorted(UrlMap(args.path).counts().items()):
+        print(f"{kind:>8} {count}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+"""
+Shared job queue so several scraper processes, on one machine or many, can
+work through one company list together.
+
+The queue is a SQLite database on a filesystem every worker can reach. Each
+job is an input row. A worker leases a few rows at a time; a lease that is
+not completed before it expires (the worker crashed or lost the share)
+becomes visible to the other workers again. A job is given up after
+max_attempts leases. Results are written once per row: a late result for a
+row that is already done is ignored, so a job that ran twice is harmless.
+
+    python work_queue.py stats queue.sqlite
+"""
+import argparse
+import json
+import os
+import socket
+import sqlite3
+import time
+
+LEASE_SECONDS = 600
+MAX_ATTEMPTS = 3
+
+
+def default_worker_id():
+    """hostname:pid, unique enough to tell workers apart in the queue."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class WorkQueue:
+    """
+    SQLite-backed queue of (row, business_name) jobs with leases.
+
+    Every method opens its own short transaction, so one WorkQueue may be
+    used from several threads and any number of processes may share the file.
+    """
+
+    def __init__(self, path, lease_seconds=LEASE_SECONDS, max_attempts=MAX_ATTEMPTS, timeout=60):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.timeout = timeout
+        with self._connect() as db:
+            db.executescript("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    row INTEGER PRIMARY KEY,
+                    business_name TEXT NOT NULL,
+                    state TEXT NOT NULL DEFAULT 'pending',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    worker TEXT,
+                    lease_expires REAL,
+                    result TEXT,
+                    error TEXT,
+                    updated_at REAL
+                );
+                CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state, lease_expires);
+                CREATE TABLE IF NOT EXISTS meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL
+                );
+            """)
+
+    def _connect(self):
+        # isolation_level=None: transactions are opened explicitly below
+        db = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+        db.execute("PRAGMA busy_timeout = %d" % (self.timeout * 1000))
+        return _Closing(db)
+
+    def enqueue(self, jobs, columns=None):
+        """
+        Adds (row, business_name) jobs and returns how many were new. Rows
+        already queued are left as they are, so enqueueing the same list
+        twice is safe. columns records the input's column order for merge().
+        """
+        now = time.time()
+        with self._connect() as db:
+            db.execute("BEGIN IMMEDIATE")
+            before = db.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+            db.executemany(
+                "INSERT OR IGNORE INTO jobs (row, business_name, updated_at) VALUES (?, ?, ?)",
+                ((int(row), name, now) for row, name in jobs)
+            )
+            if columns is not None:
+                db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('columns', ?)", (json.dumps(list(columns)),))
+            added = db.execute("SELECT COUNT(*) FROM jobs").fetchone()[0] - before
+            db.execute("COMMIT")
+        return added
+
+    def columns(self):
+        """The input column order recorded by enqueue(), or []."""
+        with self._connect() as db:
+            row = db.execute("SELECT value FROM meta WHERE key = 'columns'").fetchone()
+        return json.loads(row[0]) if row else []
+
+    def lease(self, worker, count=1):
+        """
+        Leases up to count jobs to a worker and returns them as (row, business_name).
+        Pending jobs come first, then jobs whose lease ran out.
+        """
+        now = time.time()
+        with self._connect() as db:
+            db.execute("BEGIN IMMEDIATE")
+            rows = db.execute(
+                "SELECT row, business_name FROM jobs"
+                " WHERE (state = 'pending' OR (state = 'leased' AND lease_expires < ?)) AND attempts < ?"
+                " ORDER BY state DESC, row LIMIT ?",
+                (now, self.max_attempts, count)
+            ).fetchall()
+            db.executemany(
+                "UPDATE jobs SET state = 'leased', worker = ?, lease_expires = ?, attempts = attempts + 1, updated_at = ?"
+                " WHERE row = ?",
+                ((worker, now + self.lease_seconds, now, row) for row, _ in rows)
+            )
+            db.execute("COMMIT")
+        return [(row, name) for row, name in rows]
+
+    def extend(self, worker, rows):
+        """Renews the worker's leases on rows it is still working on."""
+        now = time.time()
+        with self._connect() as db:
+            db.executemany(
+                "UPDATE jobs SET lease_expires = ?, updated_at = ? WHERE row = ? AND state = 'leased' AND worker = ?",
+                ((now + self.lease_seconds, now, int(row), worker) for row in rows)
+            )
+
+    def complete(self, row, worker, result):
+        """Stores a row's result. Returns False if the row was already done (the result is dropped)."""
+        now = time.time()
+        with self._connect() as db:
+            cursor = db.execute(
+                "UPDATE jobs SET state = 'done', worker = ?, result = ?, error = NULL, lease_expires = NULL, updated_at = ?"
+                " WHERE row = ? AND state != 'done'",
+                (worker, json.dumps(result, ensure_ascii=False), now, int(row))
+            )
+        return cursor.rowcount == 1
+
+    def fail(self, row, worker, error, result=None):
+        """
+        Releases a job after an error; it is retried until it has been leased
+        max_attempts times. After the last attempt the job is 'failed', or,
+        if a result is given (e.g. a row with an error note), done with that result.
+        """
+        now = time.time()
+        final_result = json.dumps(result, ensure_ascii=False) if result is not None else None
+        with self._connect() as db:
+            db.execute(
+                "UPDATE jobs SET"
+                " state = CASE WHEN attempts < ? THEN 'pending' WHEN ? IS NULL THEN 'failed' ELSE 'done' END,"
+                " result = CASE WHEN attempts < ? THEN result ELSE ? END,"
+                " error = ?, lease_expires = NULL, updated_at = ?"
+                " WHERE row = ? AND state = 'leased' AND worker = ?",
+                (self.max_attempts, final_result, self.max_attempts, final_result, str(error), now, int(row), worker)
+            )
+
+    def retry_failed(self):
+        """Puts failed jobs, and leased ones that ran out of attempts, back to pending. Returns how many."""
+        with self._connect() as db:
+            cursor = db.execute(
+                "UPDATE jobs SET state = 'pending', attempts = 0, lease_expires = NULL"
+                " WHERE state = 'failed' OR (state = 'leased' AND lease_expires < ? AND attempts >= ?)",
+                (time.time(), self.max_attempts)
+            )
+        return cursor.rowcount
+
+    def stats(self):
+        """Returns {state: job count}, with 'expired' for leases that ran out."""
+        now = time.time()
+        counts = {'pending': 0, 'leased': 0, 'expired': 0, 'done': 0, 'failed': 0}
+        with self._connect() as db:
+            for state, expired, count in db.execute(
+                "SELECT state, state = 'leased' AND lease_expires < ?, COUNT(*) FROM jobs GROUP BY 1, 2", (now,)
+            ):
+                key = 'expired' if expired else state
+                counts[key] = counts.get(key, 0) + count
+        return counts
+
+    def is_drained(self):
+        """True once no job can be leased now or later (everything done, failed or out of attempts)."""
+        with self._connect() as db:
+            row = db.execute(
+                "SELECT COUNT(*) FROM jobs WHERE state IN ('pending', 'leased') AND attempts < ?"
+                " OR (state = 'leased' AND lease_expires >= ?)",
+                (self.max_attempts, time.time())
+            ).fetchone()
+        return row[0] == 0
+
+    def results(self):
+        """Yields (row, business_name, result) for the finished jobs, in row order."""
+        with self._connect() as db:
+            for row, name, result in db.execute(
+                "SELECT row, business_name, result FROM jobs WHERE state = 'done' ORDER BY row"
+            ):
+                yield row, name, json.loads(result)
+
+    def unfinished(self):
+        """Yields (row, business_name, state, error) for the jobs that have no result, in row order."""
+        with self._connect() as db:
+            yield from db.execute(
+                "SELECT row, business_name, state, error FROM jobs WHERE state != 'done' ORDER BY row"
+            ).fetchall()
+
+
+class _Closing:
+    """Context manager that closes a connection on exit (sqlite3's own only ends the transaction)."""
+
+    def __init__(self, db):
+        self.db = db
+
+    def __enter__(self):
+        return self.db
+
+    def __exit__(self, exc_type, *exc):
+        if exc_type is not None and self.db.in_transaction:
+            self.db.execute("ROLLBACK")
+        self.db.close()
+        return False
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect a scraper work queue.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    stats_parser = subparsers.add_parser('stats', help="Show how many jobs are in each state")
+    stats_parser.add_argument('queue')
+    retry_parser = subparsers.add_parser('retry-failed', help="Put failed jobs back in the queue")
+    retry_parser.add_argument('queue')
+    args = parser.parse_args(argv)
+
+    queue = WorkQueue(args.queue)
+    if args.command == 'stats':
+        for state, count in queue.stats().items():
+            print(f"{state:>8} {count}")
+    else:
+        print(f"{queue.retry_failed()} jobs back in the queue")
+
+
+if __name__ == "__main__":
+    main()